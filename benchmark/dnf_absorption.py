@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""
+Time the DNF conversion of wide conjunctions of disjunctions.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from smpt.ptio.formula import Atom, IntegerConstant, StateFormula, TokenCount
+from smpt.ptio.ptnet import PetriNet, Place
+
+
+def grid(conjuncts, disjuncts):
+    """ Conjunction of disjunctions over distinct atoms (no absorption).
+    """
+    places = [Place("p{}".format(index)) for index in range(conjuncts)]
+    return StateFormula([StateFormula([Atom(TokenCount([pl]), IntegerConstant.of(value), '>=') for value in range(1, disjuncts + 1)], 'or') for pl in places], 'and')
+
+
+def fireability(path_net, sizes, seed):
+    """ Conjunction of random `is-fireable` disjunctions (absorption).
+    """
+    ptnet = PetriNet(path_net)
+    transitions = list(ptnet.transitions.values())
+    rng = random.Random(seed)
+
+    def is_fireable(tr):
+        return StateFormula([Atom(TokenCount([pl]), IntegerConstant.of(weight), '>=') for pl, weight in tr.pre.items()], 'and')
+
+    return StateFormula([StateFormula([is_fireable(tr) for tr in rng.sample(transitions, size)], 'or') for size in sizes], 'and')
+
+
+def main():
+    """ Main function.
+    """
+    # Arguments parser
+    parser = argparse.ArgumentParser(description='Time the DNF conversion of wide conjunctions of disjunctions')
+
+    parser.add_argument('--net',
+                        type=str,
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nets', 'E-Abstraction', 'Kanban', 'Kanban-00005.net'),
+                        help='path to the Petri net of the fireability case')
+
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='seed of the fireability case')
+
+    results = parser.parse_args()
+
+    cases = [
+        ("and of 5 or x 6 atoms", lambda: grid(5, 6)),
+        ("and of 6 or x 6 atoms", lambda: grid(6, 6)),
+        ("and of 7 or x 6 atoms", lambda: grid(7, 6)),
+        ("fireability (839,808 combinations)", lambda: fireability(results.net, [6] * 7 + [3], results.seed)),
+    ]
+
+    for name, build in cases:
+        formula = build()
+        start = time.perf_counter()
+        formula_dnf = formula.dnf()
+        cubes = len(formula_dnf.operands) if isinstance(formula_dnf, StateFormula) and formula_dnf.operator == 'or' else 1
+        print("{}: {:.2f}s, {} cubes".format(name, time.perf_counter() - start, cubes))
+
+
+if __name__ == "__main__":
+    main()
+    print("DONE")
+    exit(0)
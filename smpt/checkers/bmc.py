@@ -332,7 +332,7 @@ class BMC(AbstractChecker):
             self.solver.write(self.ptnet.smtlib_declare_places(k, non_negative=False))
 
             info("[BMC] > Transition relation: {} -> {}".format(k - 1, k))
-            self.solver.write(self.ptnet.smtlib_transition_relation(k - 1, eq=False, tr=self.proof_enabled))
+            self.ptnet.write_transition_relation(self.solver.write, k - 1, eq=False, tr=self.proof_enabled)
 
             info("[BMC] > Push")
             self.solver.push()
@@ -406,7 +406,7 @@ class BMC(AbstractChecker):
             self.solver.write(self.ptnet_reduced.smtlib_declare_places(k, non_negative=False))
 
             info("[BMC] > Transition relation: {} -> {}".format(k - 1, k))
-            self.solver.write(self.ptnet_reduced.smtlib_transition_relation(k - 1, eq=False, tr=self.proof_enabled))
+            self.ptnet_reduced.write_transition_relation(self.solver.write, k - 1, eq=False, tr=self.proof_enabled)
 
             info("[BMC] > Push")
             self.solver.push()
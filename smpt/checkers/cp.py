@@ -173,7 +173,7 @@ class CP(AbstractChecker):
         self.solver.write(self.ptnet.smtlib_declare_places())
 
         info("[CP] \t>> Declaration of the additional variables and assertion of the reduction equations")
-        self.solver.write(self.system.smtlib())
+        self.system.write_smtlib(self.solver.write)
 
         info("[CP] \t>> Formula to check the satisfiability")
         self.solver.write(self.formula.R.smtlib(assertion=True))
@@ -41,6 +41,11 @@ from smpt.ptio.ptnet import Marking, PetriNet
 from smpt.ptio.system import System
 from smpt.ptio.verdict import Verdict
 
+# Parentheses around transitions (deleted)
+AUT_PARENTHESES = str.maketrans('', '', '()')
+
+# Backquotes and braces around place ids (deleted)
+AUT_PLACE_DELIMITERS = str.maketrans('', '', '`{}')
 
 class Enumerative(AbstractChecker):
     """ Enumerative markings method.
@@ -159,7 +164,7 @@ class Enumerative(AbstractChecker):
         try:
             with open(filename, 'r') as fp:
                 for line in fp.readlines():
-                    content = line.strip().replace('(', '').replace(')', '').split(',')
+                    content = line.strip().translate(AUT_PARENTHESES).split(',')
                     if len(content) >= 3 and content[0] == content[-1]:
                         content = split(r'\s+', content[1].replace('"', ''))
                         consistent = True
@@ -170,8 +175,7 @@ class Enumerative(AbstractChecker):
                                 consistent = False
                                 break
                             place_marking = place_marking[1].split('*')
-                            place_id = place_marking[0].replace(
-                                '`', '').replace('{', '').replace('}', '')
+                            place_id = place_marking[0].translate(AUT_PLACE_DELIMITERS)
                             if place_id == '':
                                 consistent = False
                                 break
@@ -236,7 +240,7 @@ class Enumerative(AbstractChecker):
         info("[ENUMERATIVE] Declaration of the places")
         self.solver.write(self.ptnet.smtlib_declare_places())
         info("[ENUMERATIVE] Reduction equations")
-        self.solver.write(self.system.smtlib())
+        self.system.write_smtlib(self.solver.write)
         info("[ENUMERATIVE] Formula to check the satisfiability")
         self.solver.write(self.formula.R.smtlib(assertion=True))
         info("[ENUMERATIVE] Markings from the reduced Petri net")
@@ -237,7 +237,7 @@ class Induction(AbstractChecker):
         self.solver.write(self.ptnet.smtlib_declare_places(0))
 
         info("[K-INDUCTION] > Assert reduction equations")
-        self.solver.write(self.system.smtlib(0, 0))
+        self.system.write_smtlib(self.solver.write, 0, 0)
 
         info("[INDUCTION] > Push")
         self.solver.push()
@@ -261,7 +261,7 @@ class Induction(AbstractChecker):
         self.solver.write(self.ptnet.smtlib_declare_places(1))
 
         info("[K-INDUCTION] > Assert reduction equations")
-        self.solver.write(self.system.smtlib(1, 1))
+        self.system.write_smtlib(self.solver.write, 1, 1)
 
         info("[INDUCTION] > Transition relation: 0 -> 1")
         self.solver.write(
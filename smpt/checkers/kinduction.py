@@ -255,9 +255,9 @@ class KInduction(AbstractChecker):
                 info("[K-INDUCTION] > Declaration of the transitions from the Petri net")
                 self.solver.write(self.ptnet.smtlib_declare_transitions())
                 info("[K-INDUCTION] > State Equation")
-                self.solver.write(self.ptnet.smtlib_state_equation(0))
+                self.ptnet.write_state_equation(self.solver.write, 0)
                 info("[K-INDUCTION] > Add read arc constraints")
-                self.solver.write(self.ptnet.smtlib_read_arc_constraints())
+                self.ptnet.write_read_arc_constraints(self.solver.write)
 
             k += 1
             info("[K-INDUCTION] > k = {}".format(k))
@@ -266,8 +266,7 @@ class KInduction(AbstractChecker):
             self.solver.write(self.ptnet.smtlib_declare_places(k))
 
             info("[K-INDUCTION] > Transition relation: {} -> {}".format(k - 1, k))
-            self.solver.write(
-                self.ptnet.smtlib_transition_relation(k - 1, eq=False))
+            self.ptnet.write_transition_relation(self.solver.write, k - 1, eq=False)
 
             info("[K-INDUCTION] > Push")
             self.solver.push()
@@ -296,7 +295,7 @@ class KInduction(AbstractChecker):
         self.solver.write(self.ptnet.smtlib_declare_places(0))
 
         info("[K-INDUCTION] > Assert reduction equations")
-        self.solver.write(self.system.smtlib(0, 0))
+        self.system.write_smtlib(self.solver.write, 0, 0)
 
         info("[K-INDUCTION] > Push")
         self.solver.push()
@@ -319,9 +318,9 @@ class KInduction(AbstractChecker):
                 info("[K-INDUCTION] > Declaration of the transitions from the Petri net")
                 self.solver.write(self.ptnet_reduced.smtlib_declare_transitions())
                 info("[K-INDUCTION] > State Equation")
-                self.solver.write(self.ptnet_reduced.smtlib_state_equation(0))
+                self.ptnet_reduced.write_state_equation(self.solver.write, 0)
                 info("[K-INDUCTION] > Add read arc constraints")
-                self.solver.write(self.ptnet_reduced.smtlib_read_arc_constraints())
+                self.ptnet_reduced.write_read_arc_constraints(self.solver.write)
 
             k += 1
             info("[K-INDUCTION] > k = {}".format(k))
@@ -330,11 +329,10 @@ class KInduction(AbstractChecker):
             self.solver.write(self.ptnet.smtlib_declare_places(k))
 
             info("[K-INDUCTION] > Assert reduction equations")
-            self.solver.write(self.system.smtlib(k, k))
+            self.system.write_smtlib(self.solver.write, k, k)
 
             info("[K-INDUCTION] > Transition relation: {} -> {}".format(k - 1, k))
-            self.solver.write(
-                self.ptnet_reduced.smtlib_transition_relation(k - 1, eq=False))
+            self.ptnet_reduced.write_transition_relation(self.solver.write, k - 1, eq=False)
 
             info("[K-INDUCTION] > Push")
             self.solver.push()
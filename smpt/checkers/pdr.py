@@ -197,21 +197,21 @@ class States:
         for saturated_sequence_hurdle in self.saturated_hurdle:
             for pl in saturated_sequence_hurdle:
                 if pl in self.current_delta:
-                    saturated_sequence_hurdle[pl].append(ArithmeticOperation([IntegerConstant(-self.current_delta[pl]), ArithmeticOperation([saturation_var, IntegerConstant(1)], '+')], '*'))
+                    saturated_sequence_hurdle[pl].append(ArithmeticOperation([IntegerConstant.of(-self.current_delta[pl]), ArithmeticOperation([saturation_var, IntegerConstant.of(1)], '+')], '*'))
 
         # H(t^{k+1})_j = H(t)_j + k * \Delta(t)_j if \Delta(t)_j < 0 else H(t)_j
         saturated_hurdle = {}
         for pl, hurdle in self.current_hurdle.items():
             delta = self.current_delta.get(pl, 0)
             if delta < 0 :
-                saturated_hurdle[pl] = [IntegerConstant(hurdle), ArithmeticOperation([saturation_var, IntegerConstant(-delta)], '*')]
+                saturated_hurdle[pl] = [IntegerConstant.of(hurdle), ArithmeticOperation([saturation_var, IntegerConstant.of(-delta)], '*')]
             else:
-                saturated_hurdle[pl] = [IntegerConstant(hurdle)]
+                saturated_hurdle[pl] = [IntegerConstant.of(hurdle)]
 
         self.saturated_hurdle.append(saturated_hurdle)
 
         # \Delta(t^{k+1}.\sigma) = \Delta(t^{k+1}) + \Delta(\sigma) = (k + 1) * \Delta(t) + \Delta(\sigma)
-        self.saturated_delta = {pl: self.saturated_delta.get(pl, []) + [ArithmeticOperation([IntegerConstant(self.current_delta[pl]), ArithmeticOperation([saturation_var, IntegerConstant(1)], '+')], '*')] if pl in self.current_delta else self.saturated_delta[pl] for pl in set(self.saturated_delta) | set(self.current_delta)}
+        self.saturated_delta = {pl: self.saturated_delta.get(pl, []) + [ArithmeticOperation([IntegerConstant.of(self.current_delta[pl]), ArithmeticOperation([saturation_var, IntegerConstant.of(1)], '+')], '*')] if pl in self.current_delta else self.saturated_delta[pl] for pl in set(self.saturated_delta) | set(self.current_delta)}
 
         # Clean the current hurdle and delta vectors
         self.current_hurdle, self.current_delta = {}, {}
@@ -224,13 +224,13 @@ class States:
 
             # Current hurdle
             # p >= H(\sigma)
-            hurdles = [(pl, IntegerConstant(hurdle)) for pl, hurdle in self.current_hurdle.items()]
+            hurdles = [(pl, IntegerConstant.of(hurdle)) for pl, hurdle in self.current_hurdle.items()]
 
             # Saturated hurdle
             # p >= H(\sigma') - \Delta(\sigma)
             for hurdle in self.saturated_hurdle:
                 for pl, constraint_sum in hurdle.items():
-                    lower_bound = constraint_sum + [IntegerConstant(- self.current_delta[pl])] if self.current_delta.get(pl, 0) else constraint_sum
+                    lower_bound = constraint_sum + [IntegerConstant.of(- self.current_delta[pl])] if self.current_delta.get(pl, 0) else constraint_sum
                     lower_bound = ArithmeticOperation(lower_bound, '+') if len(lower_bound) > 1 else lower_bound[0]
                     hurdles.append((pl, lower_bound))
 
@@ -243,7 +243,7 @@ class States:
         """
         if not self.composed_delta:
             # \Delta(\sigma.\sigma') = \Delta(\sigma) + \Delta(\sigma')
-            self.composed_delta = {pl: [IntegerConstant(self.current_delta[pl])] + self.saturated_delta.get(pl, []) if pl in self.current_delta else self.saturated_delta[pl] for pl in set(self.current_delta) | set(self.saturated_delta)}
+            self.composed_delta = {pl: [IntegerConstant.of(self.current_delta[pl])] + self.saturated_delta.get(pl, []) if pl in self.current_delta else self.saturated_delta[pl] for pl in set(self.current_delta) | set(self.saturated_delta)}
 
         return self.composed_delta
 
@@ -299,11 +299,11 @@ class States:
                 unsat_literals = unsat_core
 
             # Get core of the feared cube
-            literals += self.cube.learned_clauses_from_unsat_core(unsat_literals, saturated_delta=self.compose_delta())
+            literals.extend(self.cube.iter_learned_clauses(unsat_literals, saturated_delta=self.compose_delta()))
 
             # Construct the corresponding clause
             if self.saturated_hurdle:
-                literals.extend([Atom(var, IntegerConstant(0), '<') for var in self.saturation_vars])
+                literals.extend([Atom(var, IntegerConstant.of(0), '<') for var in self.saturation_vars])
                 clause = UniversalQuantification(self.saturation_vars[:], StateFormula(literals, 'or'))
             else:
                 clause = StateFormula(literals, 'or')
@@ -312,10 +312,10 @@ class States:
             # Get core of hurdles
             for literal in filter(lambda literal: 'lit@H' in literal, unsat_core):
                 place = ptnet.places[literal.split('@H')[1]]
-                literals.append(Atom(TokenCount([place]), IntegerConstant(self.hurdle[place]), '<'))
+                literals.append(Atom(TokenCount([place]), IntegerConstant.of(self.hurdle[place]), '<'))
 
             # Get core of the feared cube
-            literals += self.cube.learned_clauses_from_unsat_core(list(filter(lambda lit: 'lit@c' in lit, unsat_core)), delta=self.delta)
+            literals.extend(self.cube.iter_learned_clauses(list(filter(lambda lit: 'lit@c' in lit, unsat_core)), delta=self.delta))
 
             # Construct the corresponding clause
             clause = StateFormula(literals, "or")
@@ -344,6 +344,9 @@ class PDR(AbstractChecker):
         # System of linear equations
         self.system = system
 
+        # Reduction equations, serialized and encoded once (re-asserted after each reset)
+        self.encoded_equations = {}
+
         # Formula to study
         self.formula = formula
 
@@ -412,24 +415,32 @@ class PDR(AbstractChecker):
         """ Assert reduction equations.
 
             Orders are equivalent to the `declare_places` method.
+            Returned UTF-8 encoded, ready to be written to the solver.
         """
         if not self.reduction:
-            return ""
+            return b""
+
+        encoded_equations = self.encoded_equations.get(init)
+        if encoded_equations is not None:
+            return encoded_equations
 
         if init:
-            return self.system.smtlib_declare_additional_variables(10) \
-                   + self.system.smtlib_equations_without_places_from_reduced_net(10) \
-                   + self.system.smtlib_equations_with_places_from_reduced_net(0, 10) \
-                   + self.system.smtlib_link_nets(0, 10)
+            smt_input = self.system.smtlib_declare_additional_variables(10) \
+                        + self.system.smtlib_equations_without_places_from_reduced_net(10) \
+                        + self.system.smtlib_equations_with_places_from_reduced_net(0, 10) \
+                        + self.system.smtlib_link_nets(0, 10)
         else:
-            return self.system.smtlib_declare_additional_variables(10) \
-                   + self.system.smtlib_equations_without_places_from_reduced_net(10) \
-                   + self.system.smtlib_equations_with_places_from_reduced_net(0, 10) \
-                   + self.system.smtlib_link_nets(0, 10) \
-                   + self.system.smtlib_declare_additional_variables(11) \
-                   + self.system.smtlib_equations_without_places_from_reduced_net(11) \
-                   + self.system.smtlib_equations_with_places_from_reduced_net(1, 11) \
-                   + self.system.smtlib_link_nets(1, 11)
+            smt_input = self.system.smtlib_declare_additional_variables(10) \
+                        + self.system.smtlib_equations_without_places_from_reduced_net(10) \
+                        + self.system.smtlib_equations_with_places_from_reduced_net(0, 10) \
+                        + self.system.smtlib_link_nets(0, 10) \
+                        + self.system.smtlib_declare_additional_variables(11) \
+                        + self.system.smtlib_equations_without_places_from_reduced_net(11) \
+                        + self.system.smtlib_equations_with_places_from_reduced_net(1, 11) \
+                        + self.system.smtlib_link_nets(1, 11)
+
+        encoded_equations = self.encoded_equations[init] = smt_input.encode()
+        return encoded_equations
 
     def assert_formula(self, i):
         """ Assert Fi.
@@ -461,7 +472,7 @@ class PDR(AbstractChecker):
         # F0 = I
         marking = []
         for pl in self.ptnet_current.places.values():
-            marking.append(Atom(TokenCount([pl]), IntegerConstant(pl.initial_marking), '='))
+            marking.append(Atom(TokenCount([pl]), IntegerConstant.of(pl.initial_marking), '='))
         self.oars.append([StateFormula(marking, 'and')])
 
         # F1 = P
@@ -483,7 +494,7 @@ class PDR(AbstractChecker):
         self.solver.write(self.ptnet_current.smtlib_initial_marking(0))
         self.solver.write(self.ptnet_current.smtlib_transition_relation(0))
         self.solver.write(self.assert_equations())
-        self.solver.write(self.formula.R.smtlib(self.reduction * 10 + 1, assertion=True))
+        self.solver.write(self.formula.smtlib_encoded(self.formula.R, self.reduction * 10 + 1))
 
         return self.solver.check_sat()
 
@@ -496,7 +507,7 @@ class PDR(AbstractChecker):
         self.solver.write(self.assert_formula(k))
         self.solver.write(self.ptnet_current.smtlib_transition_relation(0, eq=False))
         self.solver.write(self.assert_equations())
-        self.solver.write(self.formula.R.smtlib(self.reduction * 10 + 1, assertion=True))
+        self.solver.write(self.formula.smtlib_encoded(self.formula.R, self.reduction * 10 + 1))
 
         return self.solver.check_sat()
 
@@ -585,7 +596,7 @@ class PDR(AbstractChecker):
             return True
 
         # Reconstruct formulas
-        self.formula.R.operands = sat_cubes
+        self.formula.R = StateFormula(sat_cubes, 'or')
         self.formula.P = StateFormula([self.formula.R], 'not')
 
         # Obtain feared states
@@ -639,7 +650,7 @@ class PDR(AbstractChecker):
             literals = []
             for place, tokens in s.tokens.items():
                 if tokens:
-                    literals.append(Atom(TokenCount([place]), IntegerConstant(tokens), ">="))
+                    literals.append(Atom(TokenCount([place]), IntegerConstant.of(tokens), ">="))
             generalization = States(StateFormula(literals, "and"))
 
         info("[PDR] \t   {}".format(generalization))
@@ -805,7 +816,7 @@ class PDR(AbstractChecker):
 
         self.solver.reset()
         self.solver.write(self.declare_places(0))
-        self.solver.write(self.formula.R.smtlib(k=0, assertion=True))
+        self.solver.write(self.formula.smtlib_encoded(self.formula.R, 0))
         self.solver.write(self.assert_formula(i))
         print("# UNSAT(R /\ Proof):", not self.solver.check_sat())
 
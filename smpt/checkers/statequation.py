@@ -223,7 +223,7 @@ class StateEquation(AbstractChecker):
         self.solver.write(ptnet.smtlib_declare_transitions(parikh=self.parikh and not skeleton))
 
         info("[STATE-EQUATION] > State Equation")
-        self.solver.write(ptnet.smtlib_state_equation(parikh=self.parikh and not skeleton))
+        ptnet.write_state_equation(self.solver.write, parikh=self.parikh and not skeleton)
 
         info("[STATE-EQUATION] > Formula to check the satisfiability")
         self.solver.write(R_current.smtlib(assertion=True))
@@ -233,7 +233,7 @@ class StateEquation(AbstractChecker):
             return Verdict.INV
 
         info("[STATE-EQUATION] > Add read arc constraints")
-        self.solver.write(ptnet.smtlib_read_arc_constraints(parikh=self.parikh and not skeleton))
+        ptnet.write_read_arc_constraints(self.solver.write, parikh=self.parikh and not skeleton)
 
         info("[STATE-EQUATION] > Check satisfiability")
         if not self.solver.check_sat():
@@ -291,13 +291,13 @@ class StateEquation(AbstractChecker):
         self.solver.write(self.ptnet.smtlib_declare_places())
 
         info("[STATE-EQUATION] > Declaration of the variables and assert reduction equations")
-        self.solver.write(self.system.smtlib())
+        self.system.write_smtlib(self.solver.write)
 
         info("[STATE-EQUATION] > Declaration of the transitions from the Petri net")
         self.solver.write(self.ptnet_reduced.smtlib_declare_transitions(parikh=self.parikh))
 
         info("[STATE-EQUATION] > State Equation")
-        self.solver.write(self.ptnet_reduced.smtlib_state_equation(parikh=self.parikh))
+        self.ptnet_reduced.write_state_equation(self.solver.write, parikh=self.parikh)
 
         info("[STATE-EQUATION] > Formula to check the satisfiability")
         self.solver.write(self.formula.R.smtlib(assertion=True))
@@ -307,7 +307,7 @@ class StateEquation(AbstractChecker):
             return Verdict.INV
 
         info("[STATE-EQUATION] > Add read arc constraints")
-        self.solver.write(self.ptnet_reduced.smtlib_read_arc_constraints(parikh=self.parikh))
+        self.ptnet_reduced.write_read_arc_constraints(self.solver.write, parikh=self.parikh)
 
         info("[STATE-EQUATION] > Check satisfiability")
         if not self.solver.check_sat():
@@ -25,17 +25,39 @@ __contact__ = "namat@laas.fr"
 __license__ = "GPLv3"
 __version__ = "5.0"
 
+import fcntl
 from logging import warning
 from multiprocessing import Queue
+from re import compile
 from subprocess import PIPE, Popen
-from sys import exit
-from typing import Any, Optional
+from sys import exit, platform
+from typing import Any, Optional, Union
 
 from sexpdata import loads
 
 from smpt.interfaces.solver import Solver
 from smpt.ptio.ptnet import Marking, PetriNet, Place, Transition
 
+# Model definitions: identifier and value (negative integers as `(- n)`)
+MODEL_DEFINITION = compile(rb'\(define-fun\s+(\S+)\s+\(\)\s+\w+\s+(\(-\s*\d+\)|[^\s()]+)\s*\)')
+
+# Spaces and parentheses around negative model values (deleted)
+MODEL_VALUE_DELIMITERS = b' ()'
+
+# Read buffer for models (64 KiB)
+MODEL_BUFFER_SIZE = 1 << 16
+
+# Capacity of the pipes with the solver (1 MiB, default `/proc/sys/fs/pipe-max-size` on Linux)
+SOLVER_PIPE_SIZE = 1 << 20
+
+# Write buffer of the instructions (64 KiB), sent to the solver whenever it fills up
+SOLVER_BUFFER_SIZE = 1 << 16
+
+# Linux `fcntl` command to resize a pipe (exposed by the `fcntl` module since Python 3.10)
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+
+# Parentheses around unsat cores (deleted)
+UNSAT_CORE_PARENTHESES = str.maketrans('', '', '()')
 
 class Z3(Solver):
     """ z3 interface.
@@ -79,12 +101,20 @@ class Z3(Solver):
         # Solver
         process = ['z3', '-in']
         if timeout:
-            process.append('-T:{}'.format(timeout))
+            process.append(f'-T:{timeout}')
         if strong_memory_limit:
             process.append('-memory:7000')
         else:
             process.append('-memory:12000')
-        self.solver: Popen = Popen(process, stdin=PIPE, stdout=PIPE, start_new_session=True)
+        self.solver: Popen = Popen(process, stdin=PIPE, stdout=PIPE, bufsize=SOLVER_BUFFER_SIZE, start_new_session=True)
+
+        # Larger pipes, fewer round trips on big inputs and models (best effort)
+        if platform.startswith('linux'):
+            for pipe in (self.solver.stdin, self.solver.stdout):
+                try:
+                    fcntl.fcntl(pipe.fileno(), F_SETPIPE_SZ, SOLVER_PIPE_SIZE)
+                except OSError:
+                    pass
 
         if solver_pids is not None:
             solver_pids.put(self.solver.pid)
@@ -115,27 +145,31 @@ class Z3(Solver):
         self.aborted = True
         exit()
 
-    def write(self, input: str, debug: bool = False) -> None:
+    def write(self, input: Union[str, bytes], debug: bool = False) -> None:
         """ Write instructions to the standard input.
 
         Parameters
         ----------
-        input : str 
-            Input instructions.
+        input : str or bytes
+            Input instructions (bytes are written as is).
         debug : bool
             Debugging flag.
         """
         if self.debug or debug:
-            print(input)
+            print(input.decode() if isinstance(input, bytes) else input)
 
-        if input != "":
+        if input:
             try:
-                self.solver.stdin.write(bytes(input, 'utf-8'))
+                self.solver.stdin.write(input if isinstance(input, bytes) else bytes(input, 'utf-8'))
             except BrokenPipeError:
                 self.abort()
 
     def flush(self) -> None:
         """ Flush the standard input.
+
+        Note
+        ----
+        Small instructions are coalesced by the write buffer, so that a query is sent in a few writes.
         """
         try:
             self.solver.stdin.flush()
@@ -219,6 +253,46 @@ class Z3(Solver):
 
         return None
 
+    def get_model(self) -> list[tuple[str, str]]:
+        """ Get the model from the current SAT stack.
+
+        Note
+        ----
+        The model is read in bulk until its parentheses are balanced (and up to the end of the line),
+        then the definitions are extracted in a single regex scan.
+
+        Returns
+        -------
+        list of tuple of str, str
+            Identifiers and values of the model.
+        """
+        # Solver instruction
+        self.write("(get-model)\n")
+        self.flush()
+
+        # Read the whole model
+        chunks, depth, started = [], 0, False
+        try:
+            while not started or depth > 0:
+                chunk = self.solver.stdout.read1(MODEL_BUFFER_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                depth += chunk.count(b'(') - chunk.count(b')')
+                started = started or b'(' in chunk
+            # Consume the end of the last line (the output may be split after the closing parenthesis)
+            if chunks and not chunks[-1].endswith(b'\n'):
+                chunks.append(self.solver.stdout.readline())
+        except BrokenPipeError:
+            self.abort()
+
+        model = b''.join(chunks)
+
+        if self.debug:
+            print(model.decode('utf-8').strip())
+
+        return [(id.decode('utf-8'), value.translate(None, MODEL_VALUE_DELIMITERS).decode('utf-8')) for id, value in MODEL_DEFINITION.findall(model)]
+
     def get_marking(self, ptnet: PetriNet, order: Optional[int] = None) -> Marking:
         """ Get a marking from the current SAT stack.
 
@@ -234,32 +308,14 @@ class Z3(Solver):
         Marking : 
             Marking from the current SAT stack.
         """
-        # Solver instruction
-        self.write("(get-model)\n")
-        self.flush()
-
-        # Read '( '
-        self.readline()
-
         # Parse the model
         marking = {}
-        while True:
-            place_content = self.readline().split(' ')
-
-            # Check if parsing done
-            if len(place_content) < 2:
-                break
-
-            place_marking = self.readline().replace(' ', '').replace(')', '')
-            place = ""
-            if order is None:
-                place = place_content[1]
-            else:
-                if '@' in place_content[1]:
-                    place_content = place_content[1].rsplit('@', 1)
-                    if int(place_content[1]) == order:
-                        place = place_content[0]
-            if place_marking and place in ptnet.places:
+        for place, place_marking in self.get_model():
+            if order is not None:
+                place, _, place_order = place.rpartition('@')
+                if not place or int(place_order) != order:
+                    continue
+            if place in ptnet.places:
                 marking[ptnet.places[place]] = int(place_marking)
 
         return Marking(marking)
@@ -277,29 +333,12 @@ class Z3(Solver):
         set of Transition : 
             Set of transitions from the parikh vector
         """
-        # Solver instruction
-        self.write("(get-model)\n")
-        self.flush()
-
-        # Read '( '
-        self.readline()
-
         # Parse the model
         parikh = set()
-        while True:
-            transition_content = self.readline().split(' ')
-
-            # Check if parsing done
-            if len(transition_content) < 2:
-                break
-
-            occurrences = self.readline().replace(' ', '').replace(')', '')
-            transition = ""
-            transition_content = transition_content[1].rsplit('@', 1)
-            if len(transition_content) > 1 and transition_content[1] == "t":
-                transition = transition_content[0]
-                if int(occurrences) > 0:
-                    parikh.add(ptnet.transitions[transition])
+        for transition, occurrences in self.get_model():
+            transition, _, suffix = transition.rpartition('@')
+            if transition and suffix == "t" and int(occurrences) > 0:
+                parikh.add(ptnet.transitions[transition])
 
         return parikh
 
@@ -318,31 +357,15 @@ class Z3(Solver):
         list of str
             Trace (ordered list of transition ids)
         """
-        # Solver instruction
-        self.write("(get-model)\n")
-        self.flush()
-
-        # Read '(model '
-        self.readline()
-
         # Parse the model
         trace = ["" for _ in range(length)]
+        transitions = list(ptnet.transitions.keys())
 
-        while True:
-            content = self.readline().split(' ')
-
-            # Check if parsing done
-            if len(content) < 2:
-                break
-
-            id = self.readline().replace(' ', '').replace(')', '')
-
-            # Get place marking and place id
-            content = content[1].rsplit('@', 1)
+        for content, id in self.get_model():
+            content, _, step = content.rpartition('@')
 
-            if content[0] == "TRACE" and id != "(-1":
-                trace[int(content[1])] = list(
-                    ptnet.transitions.keys())[int(id)]
+            if content == "TRACE" and id != "-1":
+                trace[int(step)] = transitions[int(id)]
 
         return trace
 
@@ -360,34 +383,17 @@ class Z3(Solver):
         tuple of Marking, Marking
             m and m' from the current stack.
         """
-        # Solver instruction
-        self.write("(get-model)\n")
-        self.flush()
-
-        # Read '(model '
-        self.readline()
-
         # Parse the model
         markings: list[dict[Place, int]] = [{}, {}]
-        while True:
-            place_content = self.readline().split(' ')
-
-            # Check if parsing done
-            if len(place_content) < 2:
-                break
-
+        for place_id, place_marking in self.get_model():
             # Get place marking and place id
-            place_marking = int(
-                self.readline().replace(' ', '').replace(')', ''))
-            place_content = place_content[1].rsplit('@', 1)
-            place_id = place_content[0]
+            place_id, _, order = place_id.rpartition('@')
             # Skip free variables
             if place_id not in ptnet.places:
                 continue
 
             # Add the place marking in the corresponding dictionnary
-            markings[int(place_content[1])
-                     ][ptnet.places[place_id]] = place_marking
+            markings[int(order)][ptnet.places[place_id]] = int(place_marking)
 
         return Marking(markings[0]), Marking(markings[1])
 
@@ -404,26 +410,10 @@ class Z3(Solver):
         set of Place
             Trap from the current stack.
         """
-        # Solver instruction
-        self.write("(get-model)\n")
-        self.flush()
-
-        # Read '(model '
-        self.readline()
-
         # Parse the model
         trap = set()
-        while True:
-            content = self.readline().split(' ')
-
-            # Check if parsing done
-            if len(content) < 2:
-                break
-
-            is_trap = self.readline().replace(' ', '').replace(')', '') == "true"
-            place = content[1]
-
-            if is_trap and place in ptnet.places:
+        for place, is_trap in self.get_model():
+            if is_trap == "true" and place in ptnet.places:
                 trap.add(ptnet.places[place])
 
         return trap
@@ -453,7 +443,7 @@ class Z3(Solver):
         self.write("(get-unsat-core)\n")
         self.flush()
 
-        return self.readline().replace('(', '').replace(')', '').split(' ')
+        return self.readline().translate(UNSAT_CORE_PARENTHESES).split(' ')
 
     def simplify(self, input: str) -> Any:
         """ Simplify a given formula.
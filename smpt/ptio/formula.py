@@ -26,20 +26,26 @@ __version__ = "5.0"
 
 from abc import ABC, abstractmethod
 from collections import Counter, deque
-from itertools import product
-from operator import eq, ge, gt, le, lt, ne
+from itertools import chain
+from operator import eq, ge, gt, itemgetter, le, lt, mul, ne
 from os import fsync, remove
 from re import search, split
 from tempfile import NamedTemporaryFile
-from typing import Any, Optional, Sequence
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
 from uuid import uuid4
 from xml.etree.ElementTree import Element, parse
 
 from smpt.interfaces.octant import project
 from smpt.interfaces.z3 import Z3
-from smpt.ptio.ptnet import Marking, PetriNet, Place
+from smpt.ptio.ptnet import SMTLIB_FORBIDDEN_BRACES, SMTLIB_FORBIDDEN_CHARACTERS, Marking, PetriNet, Place
 from smpt.ptio.verdict import Verdict
 
+# '#' forbidden and '{', '}' deleted in comma separated lists of names
+NAME_LIST_TRANSLATION = str.maketrans('#', '.', '{}')
+
+# Parentheses of projections replaced by spaces (support extraction)
+PARENTHESES_TO_SPACES = str.maketrans('()', '  ')
+
 TRANSLATION_COMPARISON_OPERATORS = {
     '=': eq,
     '<=': le,
@@ -67,6 +73,11 @@ COMMUTATION_COMPARISON_OPERATORS = {
     'distinct': 'distinct'
 }
 
+BOOLEAN_OPERATORS_TO_REDUCERS = {
+    'and': all,
+    'or': any
+}
+
 NEGATION_BOOLEAN_OPERATORS = {
     'and': 'or',
     'or': 'and'
@@ -114,6 +125,9 @@ XML_TO_BOOLEAN_CONSTANTS = {
     'F': False
 }
 
+# Maximal number of trie nodes visited to check the absorption of a combination of cubes
+DNF_ABSORPTION_BUDGET = 256
+
 
 class Properties:
     """ Properties.
@@ -128,6 +142,10 @@ class Properties:
         Skeleton Petri net (if colored).
     formulas : dict of str: Formula
         Set of formulas.
+    pending_formulas : dict of str: Element
+        Formulas not parsed yet (.xml format).
+    fireability : bool
+        Fireability mode.
     projected_formulas : dict of str: Formula
         Set of projected formulas.
     invariant : list of Expression
@@ -140,7 +158,7 @@ class Properties:
         Formula hashes (normal form).
     """
 
-    def __init__(self, ptnet: PetriNet, ptnet_tfg: Optional[PetriNet] = None, ptnet_skeleton: Optional[PetriNet] = None, xml_filename: Optional[str] = None, fireability: bool = False, simplify: bool = False, answered: Optional[set[str]] = None) -> None:
+    def __init__(self, ptnet: PetriNet, ptnet_tfg: Optional[PetriNet] = None, ptnet_skeleton: Optional[PetriNet] = None, xml_filename: Optional[str] = None, fireability: bool = False, simplify: bool = False, answered: Optional[set[str]] = None, lazy: bool = False) -> None:
         """ Initializer.
 
         Parameters
@@ -159,12 +177,16 @@ class Properties:
             Enable simplification formula using z3.
         answered : set of str
             Skip already answered queries (used after running hwalk).
+        lazy : bool, optional
+            Defer the parsing of the formulas until `select_queries` or `parse_pending_formulas` is called.
         """
         self.ptnet: PetriNet = ptnet
         self.ptnet_tfg: Optional[PetriNet] = ptnet_tfg
         self.ptnet_skeleton: Optional[PetriNet] = ptnet_skeleton
 
         self.formulas: dict[str, Formula] = {}
+        self.pending_formulas: dict[str, Element] = {}
+        self.fireability: bool = fireability
         self.projected_formulas: dict[str, Formula] = {}
 
         self.invariant: list[Expression] = []
@@ -174,7 +196,7 @@ class Properties:
         self.hashes: Optional[dict[str, str]] = None 
 
         if xml_filename is not None:
-            self.parse_xml(xml_filename, fireability=fireability, simplify=simplify, answered=answered)
+            self.parse_xml(xml_filename, fireability=fireability, simplify=simplify, answered=answered, lazy=lazy)
 
     def __str__(self) -> str:
         """ Properties to textual format.
@@ -184,12 +206,7 @@ class Properties:
         str
             Debugging format.
         """
-        text = ""
-
-        for formula_id, formula in self.formulas.items():
-            text += "-> Property {}\n{}\n\n".format(formula_id, formula)
-
-        return text
+        return ''.join([f"-> Property {formula_id}\n{formula}\n\n" for formula_id, formula in self.formulas.items()])
 
     def smtlib(self) -> str:
         """ Assert the properties.
@@ -203,12 +220,7 @@ class Properties:
         str
             SMT-LIB format.
         """
-        smt_input = ""
-
-        for formula_id, formula in self.formulas.items():
-            smt_input += "; -> Property {}\n{}\n".format(formula_id, formula.smtlib())
-
-        return smt_input
+        return ''.join([f"; -> Property {formula_id}\n{formula.smtlib()}\n" for formula_id, formula in self.formulas.items()])
 
     def minizinc(self) -> str:
         """ Assert the properties.
@@ -222,16 +234,15 @@ class Properties:
         str
             MiniZinc format.
         """
-        minizinc_input = ""
-
-        for formula_id, formula in self.formulas.items():
-            minizinc_input += "; -> Property {}\n{}\n".format(formula_id, formula.minizinc())
-
-        return minizinc_input
+        return ''.join([f"; -> Property {formula_id}\n{formula.minizinc()}\n" for formula_id, formula in self.formulas.items()])
 
-    def parse_xml(self, filename: str, fireability: bool = False, simplify: bool = False, answered: Optional[set[str]]= None) -> None:
+    def parse_xml(self, filename: str, fireability: bool = False, simplify: bool = False, answered: Optional[set[str]]= None, lazy: bool = False) -> None:
         """ Properties parser.
 
+        Note
+        ----
+        The simplification requires to parse the formulas to detect duplicates, thus it disables the lazy mode.
+
         Parameters
         ----------
         filename : str
@@ -242,6 +253,8 @@ class Properties:
             Enable simplification formula using z3.
         answered : set of str
             Skip already answered queries (used after running hwalk).
+        lazy : bool, optional
+            Only store the formula nodes, parsed by `parse_pending_formulas`.
         """
         tree = parse(filename)
         properties_xml = tree.getroot()
@@ -253,11 +266,31 @@ class Properties:
                 continue
 
             formula_xml = property_xml[2]
-            self.add_formula(Formula(self.ptnet, ptnet_skeleton=self.ptnet_skeleton, formula_xml=formula_xml, fireability=fireability, simplify=simplify), property_id, check_duplicates=simplify)
+            if lazy and not simplify:
+                self.pending_formulas[property_id] = formula_xml
+            else:
+                self.add_formula(Formula(self.ptnet, ptnet_skeleton=self.ptnet_skeleton, formula_xml=formula_xml, fireability=fireability, simplify=simplify), property_id, check_duplicates=simplify)
 
         # Free hashes
         self.hashes = None
 
+    def parse_pending_formulas(self) -> None:
+        """ Parse the formulas deferred by the lazy mode.
+
+        Note
+        ----
+        Parsed formulas are placed before the ones added in the meantime, as in the non-lazy mode.
+        """
+        if not self.pending_formulas:
+            return
+
+        formulas, self.formulas = self.formulas, {}
+        for property_id, formula_xml in self.pending_formulas.items():
+            self.add_formula(Formula(self.ptnet, ptnet_skeleton=self.ptnet_skeleton, formula_xml=formula_xml, fireability=self.fireability), property_id)
+        self.formulas.update(formulas)
+
+        self.pending_formulas = {}
+
     def add_formula(self, formula: Formula, property_id: Optional[str] = None, check_duplicates: bool = False, projection: bool = False) -> None:
         """ Add a formula.
 
@@ -353,7 +386,7 @@ class Properties:
             Comma separated list of transition names.
         """
         property_id = "Quasi-liveness-{}".format(quasi_live_transitions)
-        transitions = quasi_live_transitions.replace('#', '.').replace('{', '').replace('}', '').split(',')
+        transitions = quasi_live_transitions.translate(NAME_LIST_TRANSLATION).split(',')
         formula = Formula(self.ptnet, identifier=property_id)
         formula.generate_quasi_liveness(transitions)
         self.add_formula(formula, property_id)
@@ -367,7 +400,7 @@ class Properties:
             Comma separated list of place names.
         """
         property_id = "Reachability:-{}".format(reachable_places)
-        places = reachable_places.replace('#', '.').replace('{', '').replace('}', '').split(',')
+        places = reachable_places.translate(NAME_LIST_TRANSLATION).split(',')
         marking = {self.ptnet.places[pl]: 1 for pl in places}
         formula = Formula(self.ptnet, identifier=property_id)
         formula.generate_reachability(marking)
@@ -382,7 +415,14 @@ class Properties:
             List of queries.
         """
         indices = set(map(int, queries.split(',')))
-        self.formulas = {property_id: formula for index, (property_id, formula) in enumerate(self.formulas.items()) if index in indices}
+        property_ids = list(self.pending_formulas) + list(self.formulas)
+        selected = {property_id for index, property_id in enumerate(property_ids) if index in indices}
+
+        self.formulas = {property_id: formula for property_id, formula in self.formulas.items() if property_id in selected}
+
+        # Only parse the selected pending formulas
+        self.pending_formulas = {property_id: formula_xml for property_id, formula_xml in self.pending_formulas.items() if property_id in selected}
+        self.parse_pending_formulas()
 
     def dnf(self) -> Properties:
         """ Convert all formulas to Disjunctive Normal Form (DNF).
@@ -498,12 +538,12 @@ class Properties:
             projected_formula.shadow_complete = complete
 
             # Simplification query
-            support = {var for var in set(projection.replace('(', ' ').replace(')', ' ').split()) if not var.isnumeric()} - {'and', 'or', 'not', '>=', '<=', '>', '<', '+', '-', '*', 'distinct', 'false', 'true'}
+            support = {var for var in set(projection.translate(PARENTHESES_TO_SPACES).split()) if not var.isnumeric()} - {'and', 'or', 'not', '>=', '<=', '>', '<', '+', '-', '*', 'distinct', 'false', 'true'}
             declaration = ''.join(map(lambda pl: "(declare-const {} Int)\n(assert (>= {} 0))\n".format(pl, pl), support))
 
             # Parse and add the projected formula
-            projected_formula.P = projected_formula.parse_smt(Z3().simplify("{}(assert {})".format(declaration, projection).replace('{', '').replace('}', '')))
-            projected_formula.R = StateFormula([projected_formula.P], 'not')
+            projected_formula.P = projected_formula.parse_smt(Z3().simplify("{}(assert {})".format(declaration, projection).translate(SMTLIB_FORBIDDEN_BRACES)))
+            projected_formula.R = StateFormula.wrap_not(projected_formula.P)
             projected_formula.identifier = formula.identifier
             projected_formula.property_def = formula.property_def
 
@@ -594,6 +634,8 @@ class Formula:
         Path to an eventual Parikh file.
     show_complete : bool
         Shadow-completeness of the projected formula.
+    encoded_assertions : dict of (Expression, int): bytes
+        Memoized encoded SMT-LIB assertions of R and P at the fixed orders reused by PDR (indexed by the expression and the order).
     """
 
     def __init__(self, ptnet: PetriNet, ptnet_skeleton: Optional[PetriNet] = None, identifier: str = "", formula_xml: Optional[Element] = None, fireability: bool = False, simplify: bool = False) -> None:
@@ -636,6 +678,8 @@ class Formula:
         self.fireability: bool = fireability
         self.shadow_complete: bool = False
 
+        self.encoded_assertions: dict[tuple[Expression, Optional[int]], bytes] = {}
+
         # Parse XML
         if formula_xml is not None:
             _, _, node = formula_xml.tag.rpartition('}')
@@ -654,14 +698,14 @@ class Formula:
             if self.property_def == 'finally':
                 if f:
                     self.R = f
-                    self.P = StateFormula([f], 'not')
+                    self.P = StateFormula.wrap_not(f)
                 self.R_skeleton = f_skeleton
             else:
                 if f:
-                    self.R = StateFormula([f], 'not')
+                    self.R = StateFormula.wrap_not(f)
                     self.P = f
                 if f_skeleton:
-                    self.R_skeleton = StateFormula([f_skeleton], 'not')
+                    self.R_skeleton = StateFormula.wrap_not(f_skeleton)
 
             if self.R:
                 self.non_monotonic = not self.R.is_monotonic()
@@ -702,8 +746,14 @@ class Formula:
         elif node == 'deadlock':
             return self.generate_deadlock()
 
-        elif node in ['negation', 'conjunction', 'disjunction']:
-            return StateFormula([self.parse_xml(operand_xml, skeleton) for operand_xml in formula_xml], node)
+        elif node == 'negation':
+            return StateFormula.wrap_not(self.parse_xml(formula_xml[0], skeleton))
+
+        elif node == 'conjunction':
+            return StateFormula.wrap([self.parse_xml(operand_xml, skeleton) for operand_xml in formula_xml], 'and')
+
+        elif node == 'disjunction':
+            return StateFormula.wrap([self.parse_xml(operand_xml, skeleton) for operand_xml in formula_xml], 'or')
 
         elif node == 'is-fireable':
             clauses: list[Expression] = []
@@ -712,39 +762,30 @@ class Formula:
                 # skeleton `.net` input Petri net
                 transitions = [self.ptnet.transitions[tr.text] for tr in formula_xml]
 
-            elif self.ptnet.colored:
-                # colored `.pnml` input Petri net
-                transitions = []
-                for colored_transition in formula_xml:
-                    transitions += [self.ptnet.transitions[tr] for tr in self.ptnet.colored_transitions_mapping[colored_transition.text]]
-
-            elif self.ptnet.pnml_mapping:
-                # `.pnml` input Petri net
-                transitions = [self.ptnet.transitions[self.ptnet.pnml_transitions_mapping[tr.text]] for tr in formula_xml]
-
             else:
-                # `.net` input Petri net
-                transitions = [self.ptnet.transitions[tr.text.replace('#', '.').replace(',', '.')] for tr in formula_xml]
+                # colored `.pnml`, `.pnml` or `.net` input Petri net
+                transitions = [tr for name in formula_xml for tr in self.ptnet.transitions_by_xml_name[name.text.translate(SMTLIB_FORBIDDEN_CHARACTERS)]]
 
             for tr in transitions:
                 inequalities = []
                 for pl, weight in tr.pre.items():
-                    inequalities.append(Atom(TokenCount([pl]), IntegerConstant(weight), '>='))
+                    inequalities.append(Atom(TokenCount([pl]), IntegerConstant.of(weight), '>='))
 
                 if not inequalities:
-                    clauses.append(BooleanConstant(True))
-                elif len(inequalities) == 1:
-                    clauses.append(inequalities[0])
+                    clauses.append(TRUE)
                 else:
-                    clauses.append(StateFormula(inequalities, 'and'))
+                    clauses.append(StateFormula.wrap(inequalities, 'and'))
 
-            if len(clauses) == 1:
-                return clauses[0]
-            else:
-                return StateFormula(clauses, 'or')
+            return StateFormula.wrap(clauses, 'or')
 
-        elif node in ['integer-le', 'integer-ge', 'integer-eq']:
-            return Atom(self.parse_simple_expression_xml(formula_xml[0], skeleton), self.parse_simple_expression_xml(formula_xml[1], skeleton), XML_TO_COMPARISON_OPERATORS[node])
+        elif node == 'integer-le':
+            return Atom(self.parse_simple_expression_xml(formula_xml[0], skeleton), self.parse_simple_expression_xml(formula_xml[1], skeleton), '<=')
+
+        elif node == 'integer-ge':
+            return Atom(self.parse_simple_expression_xml(formula_xml[0], skeleton), self.parse_simple_expression_xml(formula_xml[1], skeleton), '>=')
+
+        elif node == 'integer-eq':
+            return Atom(self.parse_simple_expression_xml(formula_xml[0], skeleton), self.parse_simple_expression_xml(formula_xml[1], skeleton), '=')
 
         else:
             raise ValueError("Invalid .xml node")
@@ -776,24 +817,14 @@ class Formula:
                 # skeleton `.net` input Petri net
                 places = [self.ptnet_skeleton.places[place.text] for place in formula_xml]
 
-            elif self.ptnet.colored:
-                # colored `.pnml` input Petri net
-                places = []
-                for colored_place in formula_xml:
-                    places += [self.ptnet.places[pl] for pl in self.ptnet.colored_places_mapping[colored_place.text.replace('#', '.')]]
-
-            elif self.ptnet.pnml_mapping:
-                # `.pnml` input Petri net
-                places = [self.ptnet.places[self.ptnet.pnml_places_mapping[place.text.replace('#', '.')]] for place in formula_xml]
-
             else:
-                # `.net` input Petri net
-                places = [self.ptnet.places[place.text.replace('#', '.')] for place in formula_xml]
+                # colored `.pnml`, `.pnml` or `.net` input Petri net
+                places = [pl for name in formula_xml for pl in self.ptnet.places_by_xml_name[name.text.translate(SMTLIB_FORBIDDEN_CHARACTERS)]]
             return TokenCount(places)
 
         elif node == 'integer-constant':
             value = int(formula_xml.text)
-            return IntegerConstant(value)
+            return IntegerConstant.of(value)
 
         else:
             raise ValueError("Invalid .xml node")
@@ -888,22 +919,20 @@ class Formula:
 
         else:
             # `.net` input Petri net
-            transitions = [self.ptnet.transitions[tr.replace('#', '.').replace(',', '.')]]
+            transitions = [self.ptnet.transitions[tr.translate(SMTLIB_FORBIDDEN_CHARACTERS)]]
 
         for transition in transitions:
             inequalities = []
             for pl, weight in transition.pre.items():
-                inequality = Atom(TokenCount([pl]), IntegerConstant(weight), '>=')
+                inequality = Atom(TokenCount([pl]), IntegerConstant.of(weight), '>=')
                 inequalities.append(inequality)
 
             if not inequalities:
-                clauses.append(BooleanConstant(True))
-            elif len(inequalities) == 1:
-                clauses.append(inequalities[0])
+                clauses.append(TRUE)
             else:
-                clauses.append(StateFormula(inequalities, 'and'))
+                clauses.append(StateFormula.wrap(inequalities, 'and'))
 
-        predicate: SimpleExpression = clauses[0] if len(clauses) == 1 else StateFormula(clauses, 'or')
+        predicate: SimpleExpression = StateFormula.wrap(clauses, 'or')
         
         # Memoize and returns
         if tr not in predicates:
@@ -966,11 +995,11 @@ class Formula:
                 if places:
                     return TokenCount(places, delta=sum(constants), multipliers=multipliers)
                 else:
-                    return IntegerConstant(sum(constants))
+                    return IntegerConstant.of(sum(constants))
             else:    
                 return None
 
-    def parse_smt(self, simplified_formula: Any, lets: dict[str, SimpleExpression] = {}, predicates: dict[str, SimpleExpression] = {}, skeleton: bool = False) -> Optional[Expression]:
+    def parse_smt(self, simplified_formula: Any, lets: Optional[dict[str, SimpleExpression]] = None, predicates: Optional[dict[str, SimpleExpression]] = None, skeleton: bool = False) -> Optional[Expression]:
         """ Parse simplified formula (SMT-LIB format).
 
         Parameters
@@ -984,19 +1013,25 @@ class Formula:
         skeleton : bool, optional
             Parsing skeleton property.
         """
+        # Fresh associations for each top-level call (no shared default)
+        if lets is None:
+            lets = {}
+        if predicates is None:
+            predicates = {}
+
         # Constant, let reference, boolean, transition predicate 
         if type(simplified_formula) is not list:
 
             element = str(simplified_formula)
 
             if element.isnumeric():
-                return IntegerConstant(int(element))
+                return IntegerConstant.of(int(element))
 
             elif element in lets:
                 return lets[element]
 
             elif element in ["true", "false"]:
-                return BooleanConstant(element == "true")
+                return BooleanConstant.of(element == "true")
             else:
                 return self.smt_expand_fireability(element, predicates, skeleton)
 
@@ -1027,19 +1062,19 @@ class Formula:
                 # Boolean simplification
                 if isinstance(parsed_expr, BooleanConstant):
                     if operator == 'not':
-                        return BooleanConstant(not parsed_expr.value)
+                        return BooleanConstant.of(not parsed_expr.value)
                     elif (parsed_expr.value == True and operator == 'and') or (parsed_expr.value == False and operator == 'or'):
                         parsed_expr = None
                     elif (parsed_expr.value == True and operator == 'or'):
-                        return BooleanConstant(True)
+                        return TRUE
                     elif (parsed_expr.value == False and operator == 'and'):
-                        return BooleanConstant(False)
+                        return FALSE
 
                 if parsed_expr is not None:
                     operands.append(parsed_expr)
 
             if not operands:
-                return BooleanConstant(False) if operator in ["or", "not"] else BooleanConstant(True)
+                return FALSE if operator in ["or", "not"] else TRUE
 
             elif operator != "not" and len(operands) == 1:
                 return operands[0]
@@ -1134,7 +1169,7 @@ class Formula:
             if places:
                 return TokenCount(places, delta=integer_constant, multipliers=multipliers)
             else:
-                return IntegerConstant(integer_constant)
+                return IntegerConstant.of(integer_constant)
 
         # Number of opened parenthesis (not close)
         open_parenthesis = 0
@@ -1213,7 +1248,7 @@ class Formula:
 
             elif token in ['T', 'F']:
                 # Construct BooleanConstant
-                stack_operands[-1].append(BooleanConstant(
+                stack_operands[-1].append(BooleanConstant.of(
                     XML_TO_BOOLEAN_CONSTANTS[token]))
 
             else:
@@ -1245,10 +1280,7 @@ class Formula:
             operands, operator = None, None
             self.P = stack_operands.pop()[0]
 
-        if operator == 'not':
-            self.R = operands[0]
-        else:
-            self.R = StateFormula([self.P], 'not')
+        self.R = StateFormula.wrap_not(self.P)
 
         self.property_def = 'globally'
 
@@ -1264,7 +1296,7 @@ class Formula:
         str
             Debugging format.
         """
-        return "--> R\n{}\n\n--> P\n{}".format(str(self.R), str(self.P))
+        return f"--> R\n{self.R}\n\n--> P\n{self.P}"
 
     def smtlib(self) -> str:
         """ Assert the Formula.
@@ -1278,7 +1310,37 @@ class Formula:
         str
             SMT-LIB format.
         """
-        return "; --> R\n{}\n; --> P\n{}".format(self.R.smtlib(assertion=True), self.P.smtlib(assertion=True))
+        return f"; --> R\n{self.R.smtlib(assertion=True)}\n; --> P\n{self.P.smtlib(assertion=True)}"
+
+    def smtlib_encoded(self, expression: Expression, k: Optional[int] = None) -> bytes:
+        """ Assert R or P, serialized and encoded once for each order.
+
+        Parameters
+        ----------
+        expression : Expression
+            Feared (R) or unfeared (P) events.
+        k : int, optional
+            Order.
+
+        Returns
+        -------
+        bytes
+            SMT-LIB format (UTF-8 encoded, ready to be written to a solver).
+
+        Note
+        ----
+        Intended for the fixed orders asserted again and again (PDR), the unrolling checkers
+        (BMC, k-induction, induction) assert each order once and write `expression.smtlib` directly.
+        Indexed by the expression itself, R and P can be replaced (e.g. by PDR).
+        """
+        key = (expression, k)
+
+        encoded_assertion = self.encoded_assertions.get(key)
+        if encoded_assertion is None:
+            encoded_assertion = expression.smtlib(k, assertion=True).encode()
+            self.encoded_assertions[key] = encoded_assertion
+
+        return encoded_assertion
 
     def minizinc(self) -> str:
         """ Assert the Formula.
@@ -1292,7 +1354,7 @@ class Formula:
         str
             MiniZinc format.
         """
-        return "; --> R\n{}\n; --> P\n{}".format(self.R.minizinc(assertion=True), self.P.minizinc(assertion=True))
+        return f"; --> R\n{self.R.minizinc(assertion=True)}\n; --> P\n{self.P.minizinc(assertion=True)}"
 
     def walk(self) -> str:
         """ Assert the Formula.
@@ -1306,7 +1368,7 @@ class Formula:
         str
             .ltl format.
         """
-        return "; --> P\n{}\n;".format(self.P.walk())
+        return f"; --> P\n{self.P.walk()}\n;"
 
     def generate_walk_file(self) -> None:
         """ Generate temporary file in .ltl format.
@@ -1362,17 +1424,15 @@ class Formula:
             inequalities_R = []
 
             for pl, weight in tr.pre.items():
-                inequalities_R.append(Atom(TokenCount([pl]), IntegerConstant(weight), '<'))
+                inequalities_R.append(Atom(TokenCount([pl]), IntegerConstant.of(weight), '<'))
 
             if not inequalities_R:
-                clauses_R.append(BooleanConstant(False))
-            elif len(inequalities_R) == 1:
-                clauses_R.append(inequalities_R[0])
+                clauses_R.append(FALSE)
             else:
-                clauses_R.append(StateFormula(inequalities_R, 'or'))
+                clauses_R.append(StateFormula.wrap(inequalities_R, 'or'))
 
-        self.R = StateFormula(clauses_R, 'and')
-        self.P = StateFormula([self.R], 'not')
+        self.R = StateFormula.wrap(clauses_R, 'and')
+        self.P = StateFormula.wrap_not(self.R)
 
         self.property_def = 'finally'
         self.non_monotonic = True
@@ -1393,17 +1453,15 @@ class Formula:
             inequalities_R = []
 
             for pl, weight in self.ptnet.transitions[tr_id].pre.items():
-                inequalities_R.append(Atom(TokenCount([pl]), IntegerConstant(weight), '>='))
+                inequalities_R.append(Atom(TokenCount([pl]), IntegerConstant.of(weight), '>='))
 
             if not inequalities_R:
-                clauses_R.append(BooleanConstant(True))
-            elif len(inequalities_R) == 1:
-                clauses_R.append(inequalities_R[0])
+                clauses_R.append(TRUE)
             else:
-                clauses_R.append(StateFormula(inequalities_R, 'and'))
+                clauses_R.append(StateFormula.wrap(inequalities_R, 'and'))
 
-        self.R = StateFormula(clauses_R, 'or')
-        self.P = StateFormula([self.R], 'not')
+        self.R = StateFormula.wrap(clauses_R, 'or')
+        self.P = StateFormula.wrap_not(self.R)
         self.property_def = 'finally'
 
     def generate_reachability(self, marking: dict[Place, int]) -> None:
@@ -1417,10 +1475,10 @@ class Formula:
         clauses_R = []
 
         for pl, tokens in marking.items():
-            clauses_R.append(Atom(TokenCount([pl]), IntegerConstant(tokens), '>='))
+            clauses_R.append(Atom(TokenCount([pl]), IntegerConstant.of(tokens), '>='))
 
-        self.R = StateFormula(clauses_R, 'and')
-        self.P = StateFormula([self.R], 'not')
+        self.R = StateFormula.wrap(clauses_R, 'and')
+        self.P = StateFormula.wrap_not(self.R)
         self.property_def = 'finally'
 
     def dnf(self) -> Formula:
@@ -1471,6 +1529,8 @@ class SimpleExpression(ABC):
     Cannot be evaluated to 'TRUE' or 'FALSE'.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def __str__(self) -> str:
         """ SimpleExpression to textual format.
@@ -1483,12 +1543,12 @@ class SimpleExpression(ABC):
         pass
 
     @abstractmethod
-    def __eq__(self, other: Any) -> bool:
+    def __eq__(self, other: object) -> bool:
         """ Compare the SimpleExpression for equality.
 
         Parameters
         ----------
-        other : any
+        other : object
             Other object to compare.
         
         Returns
@@ -1529,6 +1589,21 @@ class SimpleExpression(ABC):
         """
         pass
 
+    def smtlib_plain(self, k: int = None) -> str:
+        """ Assert the SimpleExpression (without delta).
+
+        Parameters
+        ----------
+        k : int, optional
+            Order.
+
+        Returns
+        -------
+        str
+            SMT-LIB format.
+        """
+        return self.smtlib(k)
+
     @abstractmethod
     def minizinc(self) -> str:
         """ Assert the SimpleExpression.
@@ -1631,6 +1706,8 @@ class Expression(SimpleExpression):
     Can be evaluated to 'TRUE' or 'FALSE'.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def smtlib(self, k: int = None, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None, assertion: bool = False, negation: bool = False) -> str:
         """ Assert the Expression.
@@ -1708,6 +1785,22 @@ class Expression(SimpleExpression):
         """
         pass
 
+    @abstractmethod
+    def nnf(self, negation_propagation: bool = False) -> Expression:
+        """ Convert to Negation Normal Form (NNF).
+
+        Parameters
+        ----------
+        negation_propagation : bool
+            Propagate a negation.
+
+        Returns
+        -------
+        Expression
+            NNF of the Expression.
+        """
+        pass
+
     @abstractmethod
     def dnf(self, negation_propagation: bool = False) -> Expression:
         """ Convert to Disjunctive Normal Form (DNF).
@@ -1778,8 +1871,24 @@ class StateFormula(Expression):
         A list of operands.
     operator : str
         A boolean operator (not, and, or).
+    nnf_cache : dict of bool: Expression
+        Memoized NNFs (indexed by the negation propagation flag).
+    dnf_cache : dict of bool: Expression
+        Memoized DNFs (indexed by the negation propagation flag).
+    smtlib_cache : dict of int: str
+        Memoized SMT-LIB serializations without delta (indexed by the order).
+    minizinc_walk_separator : str
+        Separator of the operands (MiniZinc and .ltl formats).
+    eval_order : list of Expression
+        Operands in evaluation order (leaves before nested StateFormulas).
+    op : BooleanOperator
+        Precomputed properties of the operator.
+    hash_value : int
+        Hash of the StateFormula (computed once, StateFormulas are not modified after construction).
     """
 
+    __slots__ = ('operands', 'operator', 'nnf_cache', 'dnf_cache', 'smtlib_cache', 'minizinc_walk_separator', 'eval_order', 'op', 'hash_value')
+
     def __init__(self, operands: Sequence[Expression], operator: str) -> None:
         """ Initializer.
 
@@ -1790,6 +1899,10 @@ class StateFormula(Expression):
         operator : str
             Operator (not, and, or).
 
+        Note
+        ----
+        Nested conjunctions (resp. disjunctions) are flattened and duplicated operands are removed.
+
         Raises
         ------
         ValueError
@@ -1798,13 +1911,172 @@ class StateFormula(Expression):
         self.operands: Sequence[Expression] = operands
 
         self.operator: str = ''
-        if operator in ['not', 'and', 'or']:
+        if operator == 'and' or operator == 'or' or operator == 'not':
             self.operator = operator
-        elif operator in ['negation', 'conjunction', 'disjunction']:
+        elif operator in XML_TO_BOOLEAN_OPERATORS:
+            # Kept for external callers, the parsers provide normalized operators
             self.operator = XML_TO_BOOLEAN_OPERATORS[operator]
         else:
             raise ValueError("Invalid operator for a state formula")
 
+        self.op: BooleanOperator = BOOLEAN_OPERATORS[self.operator]
+
+        if self.operator != 'not':
+            flattened_operands: list[Expression] = []
+            for operand in operands:
+                if isinstance(operand, StateFormula) and operand.operator == self.operator:
+                    flattened_operands.extend(operand.operands)
+                else:
+                    flattened_operands.append(operand)
+            self.operands = list(dict.fromkeys(flattened_operands))
+
+        self.nnf_cache: dict[bool, Expression] = {}
+        self.dnf_cache: dict[bool, Expression] = {}
+        self.smtlib_cache: dict[Optional[int], str] = {}
+
+        self.minizinc_walk_separator: str = ' '
+        if len(self.operands) > 1 and self.operator != 'not':
+            self.minizinc_walk_separator = self.op.minizinc_walk_separator
+
+        # Cheap operands first, so that `all` / `any` short-circuit sooner
+        self.eval_order: list[Expression] = sorted(self.operands, key=lambda operand: isinstance(operand, StateFormula))
+
+        # Nested StateFormulas hash in constant time, so deep formulas do not recurse
+        self.hash_value: int = hash((tuple(self.operands), self.operator))
+
+    @staticmethod
+    def wrap_not(expr: Expression) -> Expression:
+        """ Negate an Expression, eliminating double negations.
+
+        Parameters
+        ----------
+        expr : Expression
+            Expression to negate.
+
+        Returns
+        -------
+        Expression
+            `x` if `expr` is `(not x)`, `(not expr)` otherwise.
+        """
+        if isinstance(expr, StateFormula) and expr.operator == 'not':
+            return expr.operands[0]
+
+        return StateFormula([expr], 'not')
+
+    @staticmethod
+    def wrap(operands: Sequence[Expression], operator: str) -> Expression:
+        """ Combine operands with a boolean operator, collapsing single-operand conjunctions and disjunctions.
+
+        Parameters
+        ----------
+        operands : Sequence[Expression]
+            List of operands.
+        operator : str
+            Operator (and, or).
+
+        Returns
+        -------
+        Expression
+            The operand if there is only one, the StateFormula otherwise.
+        """
+        if len(operands) == 1:
+            return operands[0]
+
+        return StateFormula(operands, operator)
+
+    @staticmethod
+    def absorbing_product(operands: list[Sequence[Expression]]) -> list[Expression]:
+        """ Conjunctions of the combinations of cubes (one cube per operand), up to absorption.
+
+        Parameters
+        ----------
+        operands : list of Sequence[Expression]
+            Cubes (or leaves) of each operand.
+
+        Returns
+        -------
+        list of Expression
+            Conjunctions of the non-absorbed combinations, in lexicographic order.
+
+        Note
+        ----
+        Absorption: (C or (C and D)) <-> C, a combination is dropped if it includes a previous cube.
+        Combinations are enumerated lazily over their indices (odometer), and a prefix including
+        a previous cube is skipped together with all its completions.
+        The previous cubes are stored in a trie over the literal identifiers (in increasing order),
+        a check visits at most `DNF_ABSORPTION_BUDGET` nodes and keeps the combination when exceeded.
+        Prefixes (and combinations) shorter than the shortest previous cube are not checked.
+        """
+        if not operands:
+            return [StateFormula([], 'and')]
+
+        # Literals of each cube, indexed by their identifiers (numbered by first occurrence, so that the identifiers follow the operands)
+        literal_ids: dict[Expression, int] = {}
+        operands_literals = [[{literal_ids.setdefault(literal, len(literal_ids)): literal for literal in (cube.operands if isinstance(cube, StateFormula) and cube.operator == 'and' else (cube,))} for cube in operand] for operand in operands]
+
+        # Trie of the previous cubes, the key -1 marking the end of a cube
+        clauses: list[Expression] = []
+        trie: dict[int, dict] = {}
+        shortest_cube = len(literal_ids) + 1
+
+        def absorbed(ids: list[int]) -> bool:
+            # Depth-first search of a previous cube among the subsets of `ids`
+            positions = {literal_id: index for index, literal_id in enumerate(ids)}
+            stack = [(trie, 0)]
+            budget = DNF_ABSORPTION_BUDGET
+            while stack and budget:
+                node, start = stack.pop()
+                if -1 in node:
+                    return True
+                budget -= 1
+                if len(node) < len(ids) - start:
+                    for literal_id, child in node.items():
+                        index = positions.get(literal_id, -1)
+                        if index >= start:
+                            stack.append((child, index + 1))
+                else:
+                    for index in range(start, len(ids)):
+                        child = node.get(ids[index])
+                        if child is not None:
+                            stack.append((child, index + 1))
+            return False
+
+        last = len(operands) - 1
+        indices = [0] * len(operands)
+        prefixes: list[dict[int, Expression]] = [{}] * len(operands)
+        depth = 0
+
+        while depth >= 0:
+            if indices[depth] == len(operands_literals[depth]):
+                # Backtrack
+                indices[depth] = 0
+                depth -= 1
+                if depth >= 0:
+                    indices[depth] += 1
+                continue
+
+            literals = {**prefixes[depth], **operands_literals[depth][indices[depth]]}
+            ids = sorted(literals)
+
+            if len(ids) >= shortest_cube and absorbed(ids):
+                # Skip the prefix and all its completions
+                indices[depth] += 1
+
+            elif depth < last:
+                depth += 1
+                prefixes[depth] = literals
+
+            else:
+                node = trie
+                for literal_id in ids:
+                    node = node.setdefault(literal_id, {})
+                node[-1] = {}
+                shortest_cube = min(shortest_cube, len(ids))
+                clauses.append(StateFormula(list(literals.values()), 'and'))
+                indices[depth] += 1
+
+        return clauses
+
     def __str__(self) -> str:
         """ StateFormula to textual format.
             
@@ -1814,21 +2086,21 @@ class StateFormula(Expression):
             Debugging format.
         """
         if self.operator == 'not':
-            return "(not {})".format(self.operands[0])
+            return f"(not {self.operands[0]})"
 
-        text = " {} ".format(self.operator).join(map(str, self.operands))
+        text = f" {self.operator} ".join(map(str, self.operands))
 
         if len(self.operands) > 1:
-            text = "({})".format(text)
+            text = f"({text})"
 
         return text
 
-    def __eq__(self, other: Any) -> bool:
+    def __eq__(self, other: object) -> bool:
         """ Compare the StateFormula for equality.
 
         Parameters
         ----------
-        other : any
+        other : object
             Other object to compare.
 
         Returns
@@ -1838,8 +2110,10 @@ class StateFormula(Expression):
         """
         if not isinstance(other, StateFormula):
             return NotImplemented
+        elif self.hash_value != other.hash_value:
+            return False
         else:
-            return self.operands == other.operands and self.operator == other.operator
+            return self.operator == other.operator and self.operands == other.operands
 
     def __hash__(self) -> int:
         """ Hash the StateFormula.
@@ -1849,7 +2123,7 @@ class StateFormula(Expression):
         int
             Hash of the StateFormula.
         """
-        return hash((tuple(self.operands), self.operator))
+        return self.hash_value
 
     def smtlib(self, k: int = None, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None, assertion: bool = False, negation: bool = False) -> str:
         """ Assert StateFormula.
@@ -1871,18 +2145,50 @@ class StateFormula(Expression):
         -------
         str
             SMT-LIB format.
+
+        Note
+        ----
+        Nested StateFormulas are traversed with an explicit stack (post-order).
+        The serialization without delta is memoized for each order.
         """
-        smt_input = ' '.join(map(lambda operand: operand.smtlib(
-            k, delta=delta, saturated_delta=saturated_delta), self.operands))
+        memoize = delta is None and saturated_delta is None
+        if memoize and k in self.smtlib_cache:
+            stack: list[tuple[Expression, bool]] = []
+            results: list[str] = [self.smtlib_cache[k]]
+        else:
+            stack = [(self, False)]
+            results = []
 
-        if len(self.operands) > 1 or self.operator == 'not':
-            smt_input = "({} {})".format(self.operator, smt_input)
+        while stack:
+            node, visited = stack.pop()
+
+            if not isinstance(node, StateFormula):
+                results.append(node.smtlib(k, delta=delta, saturated_delta=saturated_delta))
+
+            elif not visited:
+                stack.append((node, True))
+                stack.extend((operand, False) for operand in reversed(node.operands))
+
+            else:
+                index = len(results) - len(node.operands)
+                node_smt_input = ' '.join(results[index:])
+                del results[index:]
+
+                if len(node.operands) > 1 or node.operator == 'not':
+                    node_smt_input = f"({node.operator} {node_smt_input})"
+
+                results.append(node_smt_input)
+
+        smt_input = results[0]
+
+        if memoize:
+            self.smtlib_cache[k] = smt_input
 
         if negation:
-            smt_input = "(not {})".format(smt_input)
+            smt_input = f"(not {smt_input})"
 
         if assertion:
-            smt_input = "(assert {})\n".format(smt_input)
+            smt_input = f"(assert {smt_input})\n"
 
         return smt_input
 
@@ -1903,13 +2209,7 @@ class StateFormula(Expression):
         str
             SMT-LIB format.
         """
-        smt_input = ""
-
-        for index, operand in enumerate(self.operands):
-            smt_input += "(assert (! {} :named lit@c{}))\n".format(
-                operand.smtlib(k, delta=delta, saturated_delta=saturated_delta), index)
-
-        return smt_input
+        return ''.join([f"(assert (! {operand.smtlib(k, delta=delta, saturated_delta=saturated_delta)} :named lit@c{index}))\n" for index, operand in enumerate(self.operands)])
 
     def learned_clauses_from_unsat_core(self, unsat_core: list[str], delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> list[Expression]:
         """ Return the clauses corresponding to a given unsat core.
@@ -1928,10 +2228,32 @@ class StateFormula(Expression):
         list of Expression
             List of clauses corresponding to the unsat core.
         """
+        return list(self.iter_learned_clauses(unsat_core, delta, saturated_delta))
+
+    def iter_learned_clauses(self, unsat_core: list[str], delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> Iterator[Expression]:
+        """ Iterate over the clauses corresponding to a given unsat core.
+
+        Parameters
+        ----------
+        unsat_core : list of str
+            Unsat core.
+        delta : dict of Place: int, optional
+            Replace p by p + delta.
+        saturated_delta : dict of Place: list of Expression, optional
+            Replace p by p + saturated_delta.
+
+        Returns
+        -------
+        Iterator of Expression
+            Clauses corresponding to the unsat core (computed on demand).
+        """
         if unsat_core == ['All']:
-            return [operand.negation(delta, saturated_delta) for operand in self.operands]
+            operands: Iterable[Expression] = self.operands
         else:
-            return [self.operands[int(lit.split('@c')[1])].negation(delta, saturated_delta) for lit in unsat_core]
+            # Literals are named `lit@c{index}` (see `smtlib_unsat_core`)
+            operands = (self.operands[int(lit[5:])] for lit in unsat_core)
+
+        return (operand.negation(delta, saturated_delta) for operand in operands)
 
     def minizinc(self, assertion: bool = False) -> str:
         """ Assert the StateFormula.
@@ -1941,22 +2263,16 @@ class StateFormula(Expression):
         str
             MiniZinc format.
         """
-        if len(self.operands) > 1:
-            operator = BOOLEAN_OPERATORS_TO_MINIZINC_WALK[self.operator]
-        else:
-            operator = ''
-
-        minizinc_input = ' {} '.format(operator).join(
-            map(lambda operand: operand.minizinc(), self.operands))
+        minizinc_input = self.minizinc_walk_separator.join([operand.minizinc() for operand in self.operands])
 
         if len(self.operands) > 1 or self.operator == 'not':
-            minizinc_input = "({})".format(minizinc_input)
+            minizinc_input = f"({minizinc_input})"
 
         if self.operator == 'not':
-            minizinc_input = "(not {})".format(minizinc_input)
+            minizinc_input = f"(not {minizinc_input})"
 
         if assertion:
-            minizinc_input = "constraint {};\n".format(minizinc_input)
+            minizinc_input = f"constraint {minizinc_input};\n"
 
         return minizinc_input
 
@@ -1968,14 +2284,13 @@ class StateFormula(Expression):
         str
             Barvinok format.
         """
-        barvinok_input = ' {} '.format(self.operator).join(
-            map(lambda operand: operand.barvinok(), self.operands))
+        barvinok_input = f' {self.operator} '.join([operand.barvinok() for operand in self.operands])
 
         if len(self.operands) > 1 or self.operator == 'not':
-            barvinok_input = "({})".format(barvinok_input)
+            barvinok_input = f"({barvinok_input})"
 
         if self.operator == 'not':
-            barvinok_input = "(not {})".format(barvinok_input)
+            barvinok_input = f"(not {barvinok_input})"
 
         return barvinok_input
 
@@ -1987,19 +2302,13 @@ class StateFormula(Expression):
         str
             .ltl format.
         """
-        if len(self.operands) > 1:
-            operator = BOOLEAN_OPERATORS_TO_MINIZINC_WALK[self.operator]
-        else:
-            operator = ''
-
-        walk_input = ' {} '.format(operator).join(
-            map(lambda operand: operand.walk(), self.operands))
+        walk_input = self.minizinc_walk_separator.join([operand.walk() for operand in self.operands])
 
         if len(self.operands) > 1 or self.operator == 'not':
-            walk_input = "({})".format(walk_input)
+            walk_input = f"({walk_input})"
 
         if self.operator == 'not':
-            walk_input = "- {}".format(walk_input)
+            walk_input = f"- {walk_input}"
 
         return walk_input
 
@@ -2018,7 +2327,7 @@ class StateFormula(Expression):
         StateFormula
             Negation of the StateFormula. 
         """
-        return StateFormula([operand.negation(delta, saturated_delta) for operand in self.operands], NEGATION_BOOLEAN_OPERATORS[self.operator])
+        return StateFormula([operand.negation(delta, saturated_delta) for operand in self.operands], self.op.negation)
 
     def generalize(self, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> StateFormula:
         """ Generalize the StateFormula from a delta vector.
@@ -2037,6 +2346,67 @@ class StateFormula(Expression):
         """
         return StateFormula([operand.generalize(delta, saturated_delta) for operand in self.operands], self.operator)
 
+    def nnf(self, negation_propagation: bool = False) -> Expression:
+        """ Convert to Negation Normal Form (NNF).
+
+        Parameters
+        ----------
+        negation_propagation : bool
+            Propagate a negation.
+
+        Returns
+        -------
+        Expression
+            NNF of the StateFormula (negations are pushed to the atoms).
+
+        Note
+        ----
+        Nested StateFormulas are traversed with an explicit stack (post-order).
+        Results are memoized on each node, and unchanged subformulas are shared.
+        """
+        stack: list[tuple[Expression, bool, bool]] = [(self, negation_propagation, False)]
+        results: list[Expression] = []
+
+        while stack:
+            node, propagation, visited = stack.pop()
+
+            if not isinstance(node, StateFormula):
+                results.append(node.nnf(propagation))
+
+            elif not visited:
+                node_nnf = node.nnf_cache.get(propagation)
+                if node_nnf is not None:
+                    results.append(node_nnf)
+                elif node.operator == 'not':
+                    # NNF(not (not P)) <-> NNF(P)
+                    stack.append((node, propagation, True))
+                    stack.append((node.operands[0], not propagation, False))
+                else:
+                    stack.append((node, propagation, True))
+                    stack.extend((operand, propagation, False) for operand in reversed(node.operands))
+
+            elif node.operator == 'not':
+                node.nnf_cache[propagation] = results[-1]
+
+            else:
+                index = len(results) - len(node.operands)
+                operands_nnf = results[index:]
+                del results[index:]
+
+                if propagation:
+                    # NNF(not (P and Q)) <-> NNF(not P) or NNF(not Q)
+                    # NNF(not (P or Q)) <-> NNF(not P) and NNF(not Q)
+                    node_nnf = StateFormula(operands_nnf, node.op.negation)
+                elif all(operand_nnf is operand for operand_nnf, operand in zip(operands_nnf, node.operands)):
+                    node_nnf = node
+                else:
+                    node_nnf = StateFormula(operands_nnf, node.operator)
+
+                node.nnf_cache[propagation] = node_nnf
+                results.append(node_nnf)
+
+        return results[0]
+
     def dnf(self, negation_propagation: bool = False) -> Expression:
         """ Convert to Disjunctive Normal Form (DNF).
 
@@ -2049,60 +2419,56 @@ class StateFormula(Expression):
         -------
         Expression
             DNF of the StateFormula.
+
+        Note
+        ----
+        The StateFormula is first converted to NNF, so that the conversion only deals with conjunctions and disjunctions.
+        Nested StateFormulas are traversed with an explicit stack (post-order),
+        the DNFs of the operands being DNF themselves (disjunctions of cubes or leaves).
+        Results are memoized on each node, so shared subformulas are converted once.
         """
-        if self.operator == 'not':
-            if negation_propagation:
-                # DNF(not (not P)) <-> DNF(P)
-                return self.operands[0].dnf()
-            else:
-                # DNF(not P)
-                return self.operands[0].dnf(negation_propagation=True)
+        formula_dnf = self.dnf_cache.get(negation_propagation)
+        if formula_dnf is not None:
+            return formula_dnf
 
-        elif self.operator == 'and':
-            if negation_propagation:
-                # DNF(not (P and Q)) <-> DNF((not P) or (not Q))
-                return StateFormula([operand.dnf(negation_propagation) for operand in self.operands], 'or').dnf()
-            else:
-                # DNF(P and Q) <-> (P1 and Q1) or ... or (Pm and Q1) or ... or (Pm and Qn)
-                # with (DNF P) = (P1 or ... or Pm) and (DNF Q) = (Q1 or ... or Qn)
-                operands = []
-                for operand in self.operands:
-                    operand_dnf = operand.dnf()
-                    if isinstance(operand_dnf, StateFormula):
-                        operands.append(operand_dnf.operands)
-                    else:
-                        operands.append([operand_dnf])
+        stack: list[tuple[Expression, bool]] = [(self.nnf(negation_propagation), False)]
+        results: list[Expression] = []
 
-                clauses = []
-                for combination in product(*operands):
-                    combination_factorized: list[Expression] = []
-                    for cube in combination:
-                        if isinstance(cube, StateFormula) and cube.operator == 'and':
-                            combination_factorized += cube.operands
-                        else:
-                            combination_factorized.append(cube)
-                    clauses.append(StateFormula(combination_factorized, 'and'))
+        while stack:
+            node, visited = stack.pop()
 
-            return StateFormula(clauses, 'or')
+            if not isinstance(node, StateFormula):
+                results.append(node.dnf())
+
+            elif not visited:
+                node_dnf = node.dnf_cache.get(False)
+                if node_dnf is not None:
+                    results.append(node_dnf)
+                else:
+                    stack.append((node, True))
+                    stack.extend((operand, False) for operand in reversed(node.operands))
 
-        elif self.operator == 'or':
-            if negation_propagation:
-                # DNF(not (P or Q)) <-> DNF((not P) and (not Q))
-                return StateFormula([operand.dnf(negation_propagation) for operand in self.operands], 'and').dnf()
             else:
-                # DNF(P and Q) <-> DNF(P) and DNF(Q)
-                operands_dnf: list[Expression] = []
+                index = len(results) - len(node.operands)
+                operands_dnf = results[index:]
+                del results[index:]
+
+                if node.operator == 'and':
+                    # DNF(P and Q) <-> (P1 and Q1) or ... or (Pm and Q1) or ... or (Pm and Qn)
+                    # with (DNF P) = (P1 or ... or Pm) and (DNF Q) = (Q1 or ... or Qn)
+                    operands = [operand_dnf.operands if isinstance(operand_dnf, StateFormula) else [operand_dnf] for operand_dnf in operands_dnf]
+                    clauses = StateFormula.absorbing_product(operands)
+                else:
+                    # DNF(P or Q) <-> DNF(P) or DNF(Q)
+                    # (nested disjunctions are flattened by the initializer)
+                    clauses = operands_dnf
 
-                for operand in self.operands:
-                    operand_dnf = operand.dnf()
-                    if isinstance(operand_dnf, StateFormula):
-                        operands_dnf += operand_dnf.operands
-                    else:
-                        operands_dnf.append(operand_dnf)
-                return StateFormula(operands_dnf, 'or')
+                node_dnf = StateFormula(clauses, 'or')
+                node.dnf_cache[False] = node_dnf
+                results.append(node_dnf)
 
-        else:
-            raise ValueError("Invalid operator for a state formula")
+        self.dnf_cache[negation_propagation] = results[0]
+        return results[0]
 
     def eval(self, m: Marking) -> bool:
         """ Evaluate the StateFomula with marking m.
@@ -2117,17 +2483,11 @@ class StateFormula(Expression):
         bool
             Satisfiability of the StateFormula at marking m.
         """
-        if self.operator == 'not':
+        reducer = self.op.reducer
+        if reducer is None:
             return not self.operands[0].eval(m)
 
-        elif self.operator == 'and':
-            return all(operand.eval(m) for operand in self.operands)
-
-        elif self.operator == 'or':
-            return any(operand.eval(m) for operand in self.operands)
-
-        else:
-            return False
+        return reducer(operand.eval(m) for operand in self.eval_order)
 
     def reached_cube(self, m: Marking) -> Expression:
         """ Return a cube satisfied by marking m.
@@ -2257,9 +2617,9 @@ class StateFormula(Expression):
                 return self.operands[0].normal_form_hash(negation=True)
         else:
             if negation:
-                return '({})'.format(' {} '.format(NEGATION_BOOLEAN_OPERATORS[self.operator]).join(sorted(map(lambda operand: operand.normal_form_hash(negation=True), self.operands))))
+                return '(' + f' {NEGATION_BOOLEAN_OPERATORS[self.operator]} '.join(sorted([operand.normal_form_hash(negation=True) for operand in self.operands])) + ')'
             else:
-                return '({})'.format(' {} '.format(self.operator).join(sorted(map(lambda operand: operand.normal_form_hash(), self.operands))))
+                return '(' + f' {self.operator} '.join(sorted([operand.normal_form_hash() for operand in self.operands])) + ')'
 
 
 class Atom(Expression):
@@ -2273,8 +2633,22 @@ class Atom(Expression):
         Right operand.
     operator : str
         Operator (=, <=, >=, <, >, distinct).
+    monotonic : bool
+        Monotonic flag (computed by `dnf`).
+    anti_monotonic : bool
+        Anti-monotonic flag (computed by `dnf`).
+    dnf_cache : dict of bool: Expression
+        Memoized DNFs (indexed by the negation propagation flag).
+    op : ComparisonOperator
+        Precomputed properties of the operator.
+    smtlib_cache : dict of int: str
+        Memoized SMT-LIB serializations without delta (indexed by the order).
+    negated_atom : Atom, optional
+        Memoized negation (computed by `nnf`).
     """
 
+    __slots__ = ('left_operand', 'right_operand', 'operator', 'monotonic', 'anti_monotonic', 'dnf_cache', 'op', 'smtlib_cache', 'negated_atom')
+
     def __init__(self, left_operand: SimpleExpression, right_operand: SimpleExpression, operator: str) -> None:
         """ Initializer.
 
@@ -2292,17 +2666,24 @@ class Atom(Expression):
         ValueError
             Invalid operator for an Atom.
         """
-        if operator not in ['=', '<=', '>=', '<', '>', 'distinct']:
+        if operator not in COMPARISON_OPERATORS:
             raise ValueError("Invalid operator for an atom")
 
         self.left_operand: SimpleExpression = left_operand
         self.right_operand: SimpleExpression = right_operand
 
         self.operator: str = operator
+        self.op: ComparisonOperator = COMPARISON_OPERATORS[operator]
 
         self.monotonic: bool = False
         self.anti_monotonic: bool = False
 
+        self.dnf_cache: dict[bool, Expression] = {}
+
+        self.smtlib_cache: dict[Optional[int], str] = {}
+
+        self.negated_atom: Optional[Atom] = None
+
     def __str__(self) -> str:
         """ Atom to textual format.
 
@@ -2311,14 +2692,14 @@ class Atom(Expression):
         str
             Debugging format.
         """
-        return "({} {} {})".format(self.left_operand, self.operator, self.right_operand)
+        return f"({self.left_operand} {self.operator} {self.right_operand})"
 
-    def __eq__(self, other: Any) -> bool:
+    def __eq__(self, other: object) -> bool:
         """ Compare the Atom for equality.
 
         Parameters
         ----------
-        other : any
+        other : object
             Other object to compare.
 
         Returns
@@ -2361,15 +2742,24 @@ class Atom(Expression):
         -------
         str
             SMT-LIB format.
+
+        Note
+        ----
+        The serialization without delta is memoized for each order.
         """
-        smt_input = "({} {} {})".format(self.operator, self.left_operand.smtlib(
-            k, delta=delta, saturated_delta=saturated_delta), self.right_operand.smtlib(k, delta=delta, saturated_delta=saturated_delta))
+        if delta is None and saturated_delta is None:
+            smt_input = self.smtlib_cache.get(k)
+            if smt_input is None:
+                smt_input = self.op.smtlib_template.format(self.left_operand.smtlib_plain(k), self.right_operand.smtlib_plain(k))
+                self.smtlib_cache[k] = smt_input
+        else:
+            smt_input = self.op.smtlib_template.format(self.left_operand.smtlib(k, delta=delta, saturated_delta=saturated_delta), self.right_operand.smtlib(k, delta=delta, saturated_delta=saturated_delta))
 
         if negation:
-            smt_input = "(not {})".format(smt_input)
+            smt_input = f"(not {smt_input})"
 
         if assertion:
-            smt_input = "(assert {})\n".format(smt_input)
+            smt_input = f"(assert {smt_input})\n"
 
         return smt_input
 
@@ -2390,7 +2780,7 @@ class Atom(Expression):
         str
             SMT-LIB format.
         """
-        return "(assert (! {} :named lit@c))\n".format(self.smtlib(k, delta=delta, saturated_delta=saturated_delta))
+        return f"(assert (! {self.smtlib(k, delta=delta, saturated_delta=saturated_delta)} :named lit@c))\n"
 
     def learned_clauses_from_unsat_core(self, unsat_core: list[str], delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> list[Expression]:
         """ Return the clauses corresponding to a given unsat core.
@@ -2409,7 +2799,27 @@ class Atom(Expression):
         list of Expression
             List of clauses corresponding to the unsat core.
         """
-        return [self.negation(delta, saturated_delta)] if unsat_core else []
+        return list(self.iter_learned_clauses(unsat_core, delta, saturated_delta))
+
+    def iter_learned_clauses(self, unsat_core: list[str], delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> Iterator[Expression]:
+        """ Iterate over the clauses corresponding to a given unsat core.
+
+        Parameters
+        ----------
+        unsat_core : list of str
+            Unsat core.
+        delta : dict of Place: int, optional
+            Replace p by p + delta.
+        saturated_delta : dict of Place: list of Expression, optional
+            Replace p by p + saturated_delta.
+
+        Returns
+        -------
+        Iterator of Expression
+            Clauses corresponding to the unsat core (computed on demand).
+        """
+        if unsat_core:
+            yield self.negation(delta, saturated_delta)
 
     def minizinc(self, assertion: bool = False) -> str:
         """ Assert the Atom.
@@ -2424,11 +2834,10 @@ class Atom(Expression):
         str
             MiniZinc format.
         """
-        minizinc_input = "({} {} {})".format(
-            self.left_operand.minizinc(), self.operator, self.right_operand.minizinc())
+        minizinc_input = f"({self.left_operand.minizinc()} {self.operator} {self.right_operand.minizinc()})"
 
         if assertion:
-            minizinc_input = "constraint {};\n".format(minizinc_input)
+            minizinc_input = f"constraint {minizinc_input};\n"
 
         return minizinc_input
 
@@ -2445,7 +2854,7 @@ class Atom(Expression):
         str
             Barvinok format.
         """
-        return "({} {} {})".format(self.left_operand.barvinok(), self.operator, self.right_operand.barvinok())
+        return f"({self.left_operand.barvinok()} {self.operator} {self.right_operand.barvinok()})"
 
     def walk(self) -> str:
         """ Assert the Atom.
@@ -2455,19 +2864,16 @@ class Atom(Expression):
         str
             .ltl format.
         """
-        def place_id(pl):
-            return "{{{}}}".format(pl.id) if '-' in pl.id or '.' in pl.id else pl.id
-
         def walk_token_count(operand):
             self_literals, opposite_literals = [], []
             
             for pl in operand.places:
                 if operand.multipliers is None or pl not in operand.multipliers:
-                    self_literals.append(place_id(pl))
+                    self_literals.append(pl.walk_id)
                 elif operand.multipliers[pl] > 0:
-                    self_literals.append("{}*{}".format(operand.multipliers[pl], place_id(pl)))
+                    self_literals.append(f"{operand.multipliers[pl]}*{pl.walk_id}")
                 else:
-                    opposite_literals.append("{}*{}".format(- operand.multipliers[pl], place_id(pl)))
+                    opposite_literals.append(f"{- operand.multipliers[pl]}*{pl.walk_id}")
 
             if operand.delta > 0:
                 self_literals.append(str(operand.delta))
@@ -2485,7 +2891,7 @@ class Atom(Expression):
             elif len(l) == 1:
                 return l[0]
             else:
-                return "({})".format(' + '.join(l))
+                return '(' + ' + '.join(l) + ')'
 
         (self_left, opposite_left) = walk_token_count(self.left_operand) if isinstance(self.left_operand, TokenCount) else walk_integer_constant(self.left_operand)
         (self_right, opposite_right) = walk_token_count(self.right_operand) if isinstance(self.right_operand, TokenCount) else walk_integer_constant(self.right_operand)
@@ -2493,10 +2899,10 @@ class Atom(Expression):
         left = self_left + opposite_right
         right = self_right + opposite_left
 
-        walk_input = "({} {} {})".format(addition(left), COMPARISON_OPERATORS_TO_WALK[self.operator], addition(right))
+        walk_input = f"({addition(left)} {self.op.walk} {addition(right)})"
 
         if self.operator == 'distinct':
-            walk_input = "- {}".format(walk_input)
+            walk_input = f"- {walk_input}"
 
         return walk_input
 
@@ -2515,7 +2921,7 @@ class Atom(Expression):
         Expression
             Negation of the Atom.
         """
-        return Atom(self.left_operand.generalize(delta, saturated_delta), self.right_operand.generalize(delta, saturated_delta), NEGATION_COMPARISON_OPERATORS[self.operator])
+        return Atom(self.left_operand.generalize(delta, saturated_delta), self.right_operand.generalize(delta, saturated_delta), self.op.negation)
 
     def generalize(self, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> Expression:
         """ Generalize the Atom from a delta vector (or saturated_delta).
@@ -2534,6 +2940,29 @@ class Atom(Expression):
         """
         return Atom(self.left_operand.generalize(delta, saturated_delta), self.right_operand.generalize(delta, saturated_delta), self.operator)
 
+    def nnf(self, negation_propagation: bool = False) -> Expression:
+        """ Convert to Negation Normal Form (NNF).
+
+        Parameters
+        ----------
+        negation_propagation : bool
+            Propagate a negation.
+
+        Returns
+        -------
+        Expression
+            NNF of the Atom.
+        """
+        if not negation_propagation:
+            return self
+
+        if self.negated_atom is None:
+            # NNF(not (P comp Q)) <-> P (not comp) Q
+            self.negated_atom = Atom(self.left_operand, self.right_operand, self.op.negation)
+            self.negated_atom.negated_atom = self
+
+        return self.negated_atom
+
     def dnf(self, negation_propagation: bool = False) -> Expression:
         """ Convert to Disjunctive Normal Form (DNF).
 
@@ -2547,14 +2976,17 @@ class Atom(Expression):
         Expression
             DNF of the Atom.
         """
+        atom_dnf = self.dnf_cache.get(negation_propagation)
+        if atom_dnf is not None:
+            return atom_dnf
+
         if negation_propagation:
-            # DNF(not (P comp Q)) <-> P (not comp) Q
-            return Atom(self.left_operand, self.right_operand, NEGATION_COMPARISON_OPERATORS[self.operator]).dnf()
+            atom_dnf = self.nnf(True).dnf()
         else:
             # DNF(P comp Q) <-> P comp Q
             if isinstance(self.left_operand, IntegerConstant) and isinstance(self.right_operand, TokenCount):
                 # Normalization: TokenCount at left and IntegerConstant at right
-                return Atom(self.right_operand, self.left_operand, COMMUTATION_COMPARISON_OPERATORS[self.operator]).dnf()
+                atom_dnf = Atom(self.right_operand, self.left_operand, self.op.commutation).dnf()
             else:
                 # Compute the monotonicty and anti-monocity of the atom
                 if self.operator in ['<', '<=']:
@@ -2562,7 +2994,10 @@ class Atom(Expression):
                 elif self.operator in ['>', '>=']:
                     self.monotonic = isinstance(self.left_operand, TokenCount) and isinstance(self.right_operand, IntegerConstant)
 
-                return self
+                atom_dnf = self
+
+        self.dnf_cache[negation_propagation] = atom_dnf
+        return atom_dnf
 
     def eval(self, m: Marking) -> bool:
         """ Evaluate the Atom with marking m.
@@ -2577,7 +3012,7 @@ class Atom(Expression):
         bool
             Satisfiability of the Atom at marking m.
         """
-        return TRANSLATION_COMPARISON_OPERATORS[self.operator](self.left_operand.eval(m), self.right_operand.eval(m))
+        return self.op.comparator(self.left_operand.eval(m), self.right_operand.eval(m))
 
     def need_saturation(self, current_delta: dict[Place, int]) -> bool:
         """ Return if the Atom possibly implies a saturation following the delta vector.
@@ -2596,7 +3031,18 @@ class Atom(Expression):
         bool
             Need saturation.
         """
-        return (not self.monotonic and isinstance(self.left_operand, TokenCount) and all(current_delta[pl] < 0 for pl in self.left_operand.places if pl in current_delta)) or (not self.anti_monotonic and isinstance(self.left_operand, TokenCount) and all(current_delta[pl] > 0 for pl in self.left_operand.places if pl in current_delta)) or (not self.monotonic and not self.anti_monotonic)
+        if not self.monotonic and not self.anti_monotonic:
+            return True
+
+        if self.monotonic and self.anti_monotonic or not isinstance(self.left_operand, TokenCount):
+            return False
+
+        if self.monotonic:
+            # Monotonic: saturation if the delta increases all the places
+            return all(current_delta[pl] > 0 for pl in self.left_operand.places if pl in current_delta)
+        else:
+            # Anti-monotonic: saturation if the delta decreases all the places
+            return all(current_delta[pl] < 0 for pl in self.left_operand.places if pl in current_delta)
 
     def get_cubes(self) -> Sequence[Expression]:
         """ Return cubes.
@@ -2662,7 +3108,7 @@ class Atom(Expression):
             `True` if tautology, `False` if contraction, and `None` otherwise.
         """
         if isinstance(self.left_operand, IntegerConstant) and isinstance(self.right_operand, IntegerConstant):
-            return TRANSLATION_COMPARISON_OPERATORS[self.operator](self.left_operand.value, self.right_operand.value)
+            return self.op.comparator(self.left_operand.value, self.right_operand.value)
         
         elif hash(self.left_operand) == hash(self.right_operand):
             return self.operator in [">=", "<=", "="]
@@ -2685,9 +3131,9 @@ class Atom(Expression):
         operator = NEGATION_COMPARISON_OPERATORS[self.operator] if negation else self.operator
         
         if operator in ['>', '>=']:
-            return '{} {} {}'.format(self.right_operand.normal_form_hash(), COMMUTATION_COMPARISON_OPERATORS[operator], self.left_operand.normal_form_hash())
+            return f'{self.right_operand.normal_form_hash()} {COMMUTATION_COMPARISON_OPERATORS[operator]} {self.left_operand.normal_form_hash()}'
         else:
-            return '{} {} {}'.format(self.left_operand.normal_form_hash(), operator, self.right_operand.normal_form_hash())
+            return f'{self.left_operand.normal_form_hash()} {operator} {self.right_operand.normal_form_hash()}'
 
 
 class BooleanConstant(Expression):
@@ -2697,8 +3143,12 @@ class BooleanConstant(Expression):
     ----------
     value : bool
         A boolean constant.
+    smtlib_inputs : dict of tuple of bool: str
+        SMT-LIB formats of the constant (indexed by the assertion and negation flags).
     """
 
+    __slots__ = ('value', 'smtlib_inputs')
+
     def __init__(self, value: bool) -> None:
         """ Initializer.
 
@@ -2709,6 +3159,30 @@ class BooleanConstant(Expression):
         """
         self.value: bool = value
 
+        smtlib_value = 'true' if value else 'false'
+        self.smtlib_inputs: dict[tuple[bool, bool], str] = {
+            (False, False): smtlib_value,
+            (False, True): f"(not {smtlib_value})",
+            (True, False): f"(assert {smtlib_value})\n",
+            (True, True): f"(assert (not {smtlib_value}))\n"
+        }
+
+    @staticmethod
+    def of(value: bool) -> BooleanConstant:
+        """ Interned boolean constant.
+
+        Parameters
+        ----------
+        value : bool
+            A boolean constant.
+
+        Returns
+        -------
+        BooleanConstant
+            `TRUE` or `FALSE`.
+        """
+        return TRUE if value else FALSE
+
     def __str__(self) -> str:
         """ Boolean constant to textual format.
 
@@ -2719,12 +3193,12 @@ class BooleanConstant(Expression):
         """
         return str(self.value)
 
-    def __eq__(self, other: Any) -> bool:
+    def __eq__(self, other: object) -> bool:
         """ Compare the BooleanConstant for equality.
 
         Parameters
         ----------
-        other : any
+        other : object
             Other object to compare.
 
         Returns
@@ -2768,15 +3242,7 @@ class BooleanConstant(Expression):
         str
             SMT-LIB format.
         """
-        smt_input = str(self).lower()
-
-        if negation:
-            smt_input = "(not {})".format(smt_input)
-
-        if assertion:
-            smt_input = "(assert {})\n".format(smt_input)
-
-        return smt_input
+        return self.smtlib_inputs[(assertion, negation)]
 
     def minizinc(self, assertion: bool = False) -> str:
         """ Assert the BooleanConstant.
@@ -2794,7 +3260,7 @@ class BooleanConstant(Expression):
         minizinc_input = str(self).lower()
 
         if assertion:
-            minizinc_input = "constraint {};\n".format(minizinc_input)
+            minizinc_input = f"constraint {minizinc_input};\n"
 
         return minizinc_input
 
@@ -2823,7 +3289,7 @@ class BooleanConstant(Expression):
         Expression
             Negation of the BooleanConstant.
         """
-        return BooleanConstant(not self.value)
+        return BooleanConstant.of(not self.value)
 
     def generalize(self, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> Expression:
         """ Generalize an BooleanConstant from a delta vector (or saturated_delta).
@@ -2842,6 +3308,24 @@ class BooleanConstant(Expression):
         """
         return self
 
+    def nnf(self, negation_propagation: bool = False) -> Expression:
+        """ Convert to Negation Normal Form (NNF).
+
+        Parameters
+        ----------
+        negation_propagation : bool, optional
+            Propagate a negation.
+
+        Returns
+        -------
+        Expression
+            NNF of the BooleanConstant.
+        """
+        if negation_propagation:
+            return self.negation()
+        else:
+            return self
+
     def dnf(self, negation_propagation: bool = False) -> Expression:
         """ Convert to Disjunctive Normal Form (DNF).
 
@@ -2949,6 +3433,8 @@ class UniversalQuantification(Expression):
         Quantifier-free formula.
     """
 
+    __slots__ = ('free_variables', 'formula')
+
     def __init__(self, free_variables: list[FreeVariable], formula: Expression) -> None:
         """ Initializer.
 
@@ -2970,14 +3456,14 @@ class UniversalQuantification(Expression):
         str
             Debugging format.
         """
-        return "(forall ({}) {})".format(' '.join(map(str, self.free_variables)), self.formula)
+        return "(forall (" + ' '.join(map(str, self.free_variables)) + f") {self.formula})"
 
-    def __eq__(self, other: Any) -> bool:
+    def __eq__(self, other: object) -> bool:
         """ Compare the UniversalQuantification for equality.
 
         Parameters
         ----------
-        other : any
+        other : object
             Other object to compare.
 
         Returns
@@ -3022,20 +3508,18 @@ class UniversalQuantification(Expression):
             SMT-LIB format. 
         """
         # Declaration of the Quantified Variabbles
-        smt_input = ' '.join(
-            map(lambda var: "({} Int)".format(var.smtlib(k)), self.free_variables))
+        smt_input = ' '.join([f"({var.smtlib(k)} Int)" for var in self.free_variables])
 
         # Add `forall` operator
-        smt_input = "(forall ({}) {})".format(
-            smt_input, self.formula.smtlib(k, delta, saturated_delta))
+        smt_input = f"(forall ({smt_input}) {self.formula.smtlib(k, delta, saturated_delta)})"
 
         # Optionale negation
         if negation:
-            smt_input = "(not {})".format(smt_input)
+            smt_input = f"(not {smt_input})"
 
         # Optional assertion
         if assertion:
-            smt_input = "(assert {})".format(smt_input)
+            smt_input = f"(assert {smt_input})"
 
         return smt_input
 
@@ -3054,6 +3538,9 @@ class UniversalQuantification(Expression):
     def generalize(self, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> Expression:
         raise NotImplementedError
 
+    def nnf(self, negation_propagation: bool = False) -> Expression:
+        raise NotImplementedError
+
     def dnf(self, negation_propagation: bool = False) -> Expression:
         raise NotImplementedError
 
@@ -3078,16 +3565,40 @@ class TokenCount(SimpleExpression):
 
     Attributes
     ----------
-    places : list of Places
-        A list of places to sum.
+    places : tuple of Places
+        Places to sum (sorted by identifier after `dnf`).
     delta : int
         An offset to add.
     saturated_delta : list of Expression
         A saturated delta.
     multipliers : dict of Place: int, optional
         Place multipliers (missing if 1).
+    weights : list of int, optional
+        Multipliers aligned with the places (None if there is no multiplier).
+    single_place : Place, optional
+        The place if the TokenCount is a single place without multiplier (None otherwise).
+    getter : itemgetter, optional
+        Gather of the places token counts from a marking (None if there is less than two places).
+    normalized : bool
+        Places sorted by `dnf`.
+    delta_sign : str
+        Sign of the offset.
+    delta_abs : int
+        Absolute value of the offset.
+    smtlib_delta_prefix : str
+        Opening of the offset in SMT-LIB format (empty if there is no offset).
+    smtlib_delta_suffix : str
+        Closing of the offset in SMT-LIB format (empty if there is no offset).
+    hash_value : int, optional
+        Memoized hash.
+    str_cache : str, optional
+        Memoized textual format.
+    smtlib_cache : dict of int: str
+        Memoized SMT-LIB serializations without delta (indexed by the order).
     """
 
+    __slots__ = ('places', 'delta', 'saturated_delta', 'multipliers', 'weights', 'single_place', 'getter', 'normalized', 'delta_sign', 'delta_abs', 'smtlib_delta_prefix', 'smtlib_delta_suffix', 'hash_value', 'str_cache', 'smtlib_cache')
+
     def __init__(self, places: list[Place], delta: int = 0, saturated_delta: Optional[list[Expression]] = None, multipliers: Optional[dict[Place, int]] = None):
         """ Initializer.
 
@@ -3102,15 +3613,27 @@ class TokenCount(SimpleExpression):
         multipliers : dict of Place: int, optional
             Place multipliers (missing if 1).
         """
-        self.places: list[Place] = places
+        self.places: tuple[Place, ...] = tuple(places)
 
         self.delta: int = delta
+        self.delta_sign: str = '-' if delta < 0 else '+'
+        self.delta_abs: int = abs(delta)
+        self.smtlib_delta_prefix: str = f"({self.delta_sign} " if delta else ''
+        self.smtlib_delta_suffix: str = f" {self.delta_abs})" if delta else ''
 
         if saturated_delta is None:
             saturated_delta = []
         self.saturated_delta: list[Expression] = saturated_delta
 
         self.multipliers: dict[Place, int] = multipliers
+        self.weights: Optional[list[int]] = [multipliers.get(pl, 1) for pl in places] if multipliers else None
+        self.single_place: Optional[Place] = self.places[0] if len(self.places) == 1 and self.weights is None else None
+        self.getter: Optional[itemgetter] = itemgetter(*self.places) if len(self.places) > 1 else None
+        self.normalized: bool = False
+
+        self.hash_value: Optional[int] = None
+        self.str_cache: Optional[str] = None
+        self.smtlib_cache: dict[Optional[int], str] = {}
 
     def __str__(self) -> str:
         """ TokenCount to textual format.
@@ -3120,26 +3643,30 @@ class TokenCount(SimpleExpression):
         str
             Debugging format.
         """
-        text = ' + '.join(map(lambda pl: pl.id if self.multipliers is None or pl not in self.multipliers else "({}.{})".format(
-            self.multipliers[pl], pl.id), self.places))
+        if self.str_cache is not None:
+            return self.str_cache
+
+        multipliers = self.multipliers or {}
+        text = ' + '.join([f"({multipliers[pl]}.{pl.id})" if pl in multipliers else pl.id for pl in self.places])
 
         if self.delta:
-            text += " {} {}".format(self.sign(), abs(self.delta))
+            text += f" {self.delta_sign} {self.delta_abs}"
 
         if self.saturated_delta:
             text += ' + ' + ' + '.join(map(str, self.saturated_delta))
 
         if self.delta or self.saturated_delta or len(self.places) > 1:
-            text = "({})".format(text)
+            text = f"({text})"
 
+        self.str_cache = text
         return text
 
-    def __eq__(self, other: Any) -> bool:
+    def __eq__(self, other: object) -> bool:
         """ Compare the TokenCount for equality.
 
         Parameters
         ----------
-        other : any
+        other : object
             Other object to compare.
 
         Returns
@@ -3147,10 +3674,12 @@ class TokenCount(SimpleExpression):
         bool
             Equality of the TokenCount with other.
         """
-        if not isinstance(other, TokenCount):
+        if self is other:
+            return True
+        elif type(other) is not TokenCount:
             return NotImplemented
         else:
-            return self.places == other.places and self.delta == other.delta
+            return self.places == other.places and self.delta == other.delta and self.weights == other.weights and self.saturated_delta == other.saturated_delta
 
     def __hash__(self) -> int:
         """ Hash the TokenCount.
@@ -3160,7 +3689,10 @@ class TokenCount(SimpleExpression):
         int
             Hash of the TokenCount.
         """
-        return hash((tuple(self.places), self.delta))
+        if self.hash_value is None:
+            self.hash_value = hash((self.places, self.delta, tuple(self.weights) if self.weights is not None else None, tuple(self.saturated_delta)))
+
+        return self.hash_value
 
     def smtlib(self, k: int = None, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> str:
         """ Assert the TokenCount.
@@ -3178,30 +3710,83 @@ class TokenCount(SimpleExpression):
         -------
         str
             SMT-LIB format.
+
+        Note
+        ----
+        Without delta, the serialization is delegated to `smtlib_plain`.
         """
-        def place_smtlib(pl, k):
-            return pl.smtlib(k) if self.multipliers is None or pl not in self.multipliers else "(* {} {})".format(pl.smtlib(k), self.multipliers[pl])
+        if delta is None and saturated_delta is None:
+            return self.smtlib_plain(k)
 
-        if delta is not None:
-            smt_input = ' '.join(map(lambda pl: "(+ {} {})".format(place_smtlib(
-                pl, k), delta[pl]) if delta.get(pl, 0) != 0 else place_smtlib(pl, k), self.places))
-        elif saturated_delta is not None:
-            smt_input = ' '.join(map(lambda pl: "(+ {} {})".format(place_smtlib(pl, k), ' '.join(map(
-                lambda delta: delta.smtlib(k), saturated_delta[pl]))) if pl in saturated_delta else place_smtlib(pl, k), self.places))
-        else:
-            smt_input = ' '.join(
-                map(lambda pl: place_smtlib(pl, k), self.places))
+        multipliers = self.multipliers or {}
 
-        if len(self.places) > 1:
-            smt_input = "(+ {})".format(smt_input)
+        places_smt_input = []
+        for pl in self.places:
+            place_smt_input = pl.smtlib(k)
 
-        if self.delta:
-            smt_input = "({} {} {})".format(
-                self.sign(), smt_input, abs(self.delta))
+            if pl in multipliers:
+                place_smt_input = f"(* {place_smt_input} {multipliers[pl]})"
+
+            if delta is not None:
+                if delta.get(pl, 0) != 0:
+                    place_smt_input = f"(+ {place_smt_input} {delta[pl]})"
+            elif pl in saturated_delta:
+                place_smt_input = f"(+ {place_smt_input} {' '.join([expr.smtlib(k) for expr in saturated_delta[pl]])})"
+
+            places_smt_input.append(place_smt_input)
+
+        return self.smtlib_sum(places_smt_input, k)
+
+    def smtlib_plain(self, k: int = None) -> str:
+        """ Assert the TokenCount (without delta).
+
+        Parameters
+        ----------
+        k : int, optional
+            Order.
+
+        Returns
+        -------
+        str
+            SMT-LIB format.
+
+        Note
+        ----
+        The serialization is memoized for each order.
+        """
+        smt_input = self.smtlib_cache.get(k)
+
+        if smt_input is None:
+            multipliers = self.multipliers or {}
+            smt_input = self.smtlib_sum([f"(* {pl.smtlib(k)} {multipliers[pl]})" if pl in multipliers else pl.smtlib(k) for pl in self.places], k)
+            self.smtlib_cache[k] = smt_input
+
+        return smt_input
+
+    def smtlib_sum(self, places_smt_input: list[str], k: int = None) -> str:
+        """ Sum the serialized places with the offset and the saturated delta of the TokenCount.
+
+        Parameters
+        ----------
+        places_smt_input : list of str
+            SMT-LIB format of the places.
+        k : int, optional
+            Order.
+
+        Returns
+        -------
+        str
+            SMT-LIB format.
+        """
+        smt_input = ' '.join(places_smt_input)
+
+        if len(places_smt_input) > 1:
+            smt_input = f"(+ {smt_input})"
+
+        smt_input = self.smtlib_delta_prefix + smt_input + self.smtlib_delta_suffix
 
         if self.saturated_delta:
-            smt_input = "(+ {} {})".format(smt_input,
-                                           ' '.join(map(lambda delta: delta.smtlib(k), self.saturated_delta)))
+            smt_input = f"(+ {smt_input} {' '.join([expr.smtlib(k) for expr in self.saturated_delta])})"
 
         return smt_input
 
@@ -3213,14 +3798,14 @@ class TokenCount(SimpleExpression):
         str
             MiniZinc format.
         """
-        minizinc_input = ' + '.join(map(lambda pl: pl.id if self.multipliers is None or pl not in self.multipliers else "{} * {}".format(
-            pl.id, self.multipliers[pl]), self.places))
+        multipliers = self.multipliers or {}
+        minizinc_input = ' + '.join([f"{pl.id} * {multipliers[pl]}" if pl in multipliers else pl.id for pl in self.places])
 
         if len(self.places) > 1:
-            minizinc_input = "({})".format(minizinc_input)
+            minizinc_input = f"({minizinc_input})"
 
         if self.delta:
-            minizinc_input = "({} {} {})".format(minizinc_input, self.sign(), abs(self.delta))
+            minizinc_input = f"({minizinc_input} {self.delta_sign} {self.delta_abs})"
 
         return minizinc_input
 
@@ -3242,16 +3827,14 @@ class TokenCount(SimpleExpression):
         str
             .ltl format.
         """
-        def place_id(pl):
-            return "{{{}}}".format(pl.id) if '-' in pl.id or '.' in pl.id else pl.id
-
-        walk_input = ' + '.join(map(lambda pl: place_id(pl) if self.multipliers is None or pl not in self.multipliers else "{}*{}".format(self.multipliers[pl], place_id(pl)), self.places))
+        multipliers = self.multipliers or {}
+        walk_input = ' + '.join([f"{multipliers[pl]}*{pl.walk_id}" if pl in multipliers else pl.walk_id for pl in self.places])
 
         if len(self.places) > 1:
-            walk_input = "({})".format(walk_input)
+            walk_input = f"({walk_input})"
 
         if self.delta:
-            walk_input = "({} + {})".format(walk_input, self.delta)
+            walk_input = f"({walk_input} + {self.delta})"
 
         return walk_input
 
@@ -3270,8 +3853,8 @@ class TokenCount(SimpleExpression):
         SimpleExpression
             Generalization of the TokenCount.
         """
-        generalized_delta = self.delta + sum([delta.get(pl, 0) for pl in self.places]) if delta is not None else self.delta
-        generalized_saturated_delta = self.saturated_delta + sum([saturated_delta.get(pl, []) for pl in self.places], []) if saturated_delta is not None else self.saturated_delta
+        generalized_delta = self.delta + sum(delta.get(pl, 0) for pl in self.places) if delta is not None else self.delta
+        generalized_saturated_delta = self.saturated_delta + list(chain.from_iterable(saturated_delta.get(pl, ()) for pl in self.places)) if saturated_delta is not None else self.saturated_delta
 
         return TokenCount(self.places, delta=generalized_delta, saturated_delta=generalized_saturated_delta)
 
@@ -3283,8 +3866,20 @@ class TokenCount(SimpleExpression):
         SimpleExpression
             DNF of the TokenCount.
         """
-        # Normalization: lexicographic order
-        self.places = sorted(self.places, key=lambda pl: pl.id)
+        if self.normalized:
+            return self
+
+        # Normalization: lexicographic order (invalidates the memoized hash and serializations)
+        self.places = tuple(sorted(self.places, key=lambda pl: pl.id))
+        if self.weights is not None:
+            self.weights = [self.multipliers.get(pl, 1) for pl in self.places]
+        if self.getter is not None:
+            self.getter = itemgetter(*self.places)
+        self.hash_value = None
+        self.str_cache = None
+        self.smtlib_cache = {}
+
+        self.normalized = True
 
         # DNF(P1 + ... + Pn) = P1 + ... + Pn
         return self
@@ -3297,10 +3892,7 @@ class TokenCount(SimpleExpression):
         str
             The sign of the offset value.
         """
-        if self.delta < 0:
-            return '-'
-        else:
-            return '+'
+        return self.delta_sign
 
     def eval(self, m: Marking) -> int:
         """ Evaluate the subformula with marking m.
@@ -3315,7 +3907,20 @@ class TokenCount(SimpleExpression):
         int
             Satisfiability of the TokenCount at marking m.
         """
-        return sum([m.tokens[pl] if self.multipliers is None or pl not in self.multipliers else self.multipliers[pl] * m.tokens[pl] for pl in self.places]) + self.delta
+        # Most TokenCounts are single places
+        if self.single_place is not None:
+            return m.tokens[self.single_place] + self.delta
+
+        # Gather (single C call) and (weighted) summation loops in C
+        if self.getter is not None:
+            if self.weights is None:
+                return sum(self.getter(m.tokens)) + self.delta
+            return sum(map(mul, self.getter(m.tokens), self.weights)) + self.delta
+
+        if self.weights is None:
+            return sum(map(m.tokens.__getitem__, self.places)) + self.delta
+
+        return sum(map(mul, map(m.tokens.__getitem__, self.places), self.weights)) + self.delta
     
     def normal_form_hash(self, negation: bool = False) -> str:
         """ Hash the TokenCount into a normal form (places sorted).
@@ -3330,9 +3935,10 @@ class TokenCount(SimpleExpression):
         str
             Hash.
         """
-        nf_hash = ' + '.join(map(lambda place: "{}*{}".format(self.multipliers[place], place.id) if self.multipliers is not None and place in self.multipliers else place.id, sorted(self.places, key=lambda pl: pl.id)))
+        multipliers = self.multipliers or {}
+        nf_hash = ' + '.join([f"{multipliers[place]}*{place.id}" if place in multipliers else place.id for place in sorted(self.places, key=lambda pl: pl.id)])
         if self.delta:
-            nf_hash += ' {}'.format(self.delta)
+            nf_hash += f' {self.delta}'
         return nf_hash
 
 
@@ -3343,8 +3949,12 @@ class IntegerConstant(SimpleExpression):
     ----------
     value : int
         Constant.
+    str_value : str
+        Textual format of the constant (shared by all the formats).
     """
 
+    __slots__ = ('value', 'str_value')
+
     def __init__(self, value: int) -> None:
         """ Initializer.
 
@@ -3354,6 +3964,29 @@ class IntegerConstant(SimpleExpression):
             Constant.
         """
         self.value = value
+        self.str_value: str = str(value)
+
+    @staticmethod
+    def of(value: int) -> IntegerConstant:
+        """ Interned integer constant.
+
+        Parameters
+        ----------
+        value : int
+            Constant.
+
+        Returns
+        -------
+        IntegerConstant
+            Shared instance for the value (see `INTEGER_CONSTANTS`).
+        """
+        constant = INTEGER_CONSTANTS.get(value)
+
+        if constant is None:
+            constant = IntegerConstant(value)
+            INTEGER_CONSTANTS[value] = constant
+
+        return constant
 
     def __str__(self) -> str:
         """ Integer constant to textual format.
@@ -3363,9 +3996,9 @@ class IntegerConstant(SimpleExpression):
         str
             Debugging format.
         """
-        return str(self.value)
+        return self.str_value
 
-    def __eq__(self, other) -> bool:
+    def __eq__(self, other: object) -> bool:
         """ Compare the IntegerConstant for equality.
 
         Returns
@@ -3373,7 +4006,9 @@ class IntegerConstant(SimpleExpression):
         bool
             Equality of the IntegerConstant with other.
         """
-        if not isinstance(other, IntegerConstant):
+        if self is other:
+            return True
+        elif type(other) is not IntegerConstant:
             return NotImplemented
         else:
             return self.value == other.value
@@ -3405,7 +4040,22 @@ class IntegerConstant(SimpleExpression):
         str
             SMT-LIB format.
         """
-        return str(self)
+        return self.str_value
+
+    def smtlib_plain(self, k: int = None) -> str:
+        """ Assert the IntegerConstant (without delta).
+
+        Parameters
+        ----------
+        k : int, optional
+            Order.
+
+        Returns
+        -------
+        str
+            SMT-LIB format.
+        """
+        return self.str_value
 
     def minizinc(self) -> str:
         """ Assert the IntegerConstant.
@@ -3415,7 +4065,7 @@ class IntegerConstant(SimpleExpression):
         str
             MiniZinc format.
         """
-        return str(self)
+        return self.str_value
 
     def barvinok(self) -> str:
         """ Assert the IntegerConstant.
@@ -3425,7 +4075,7 @@ class IntegerConstant(SimpleExpression):
         str
             Barvinok format.
         """
-        return str(self)
+        return self.str_value
 
     def walk(self) -> str:
         """ Assert the IntegerConstant.
@@ -3435,7 +4085,7 @@ class IntegerConstant(SimpleExpression):
         str
             .ltl format.
         """
-        return str(self.value)
+        return self.str_value
 
     def generalize(self, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> SimpleExpression:
         """ Generalize the IntegerConstant from a delta vector (or saturated_delta).
@@ -3493,7 +4143,7 @@ class IntegerConstant(SimpleExpression):
         str
             Hash.
         """
-        return str(self.value)
+        return self.str_value
 
 
 class ArithmeticOperation(SimpleExpression):
@@ -3505,8 +4155,16 @@ class ArithmeticOperation(SimpleExpression):
         A list of operands.
     operator : str
         An operator ('+', '*').
+    hash_key : tuple of int
+        Sorted hashes of the operands (both operators are commutative).
+    operands_count : Counter of SimpleExpression, optional
+        Multiset of the operands, built only when two hash keys tie.
+    hash_value : int, optional
+        Memoized hash.
     """
 
+    __slots__ = ('operands', 'operator', 'hash_key', 'operands_count', 'hash_value')
+
     def __init__(self, operands: list[SimpleExpression], operator: str) -> None:
         """ Initializer.
 
@@ -3528,6 +4186,10 @@ class ArithmeticOperation(SimpleExpression):
         self.operands: list[SimpleExpression] = operands
         self.operator: str = operator
 
+        self.hash_key: tuple[int, ...] = tuple(sorted(map(hash, operands)))
+        self.operands_count: Optional[Counter[SimpleExpression]] = None
+        self.hash_value: Optional[int] = None
+
     def __str__(self) -> str:
         """ ArithmeticOperation to textual format.
 
@@ -3536,14 +4198,14 @@ class ArithmeticOperation(SimpleExpression):
         str
             Debugging format.
         """
-        return "(" + " {} ".format(self.operator).join(map(str, self.operands)) + ")"
+        return "(" + f" {self.operator} ".join(map(str, self.operands)) + ")"
 
-    def __eq__(self, other: Any) -> bool:
+    def __eq__(self, other: object) -> bool:
         """ Compare the ArithmeticOperation for equality.
 
         Parameters
         ----------
-        other : any
+        other : object
             Other object to compare.
 
         Returns
@@ -3551,10 +4213,20 @@ class ArithmeticOperation(SimpleExpression):
         bool
             Equality of the ArithmeticOperation with other.
         """
-        if not isinstance(other, ArithmeticOperation):
+        if self is other:
+            return True
+        elif type(other) is not ArithmeticOperation:
             return NotImplemented
         else:
-            return self.operator == other.operator and Counter(self.operands) == Counter(other.operands)
+            if self.operator != other.operator or self.hash_key != other.hash_key:
+                return False
+
+            # Full multiset comparison only on hash keys tie
+            if self.operands_count is None:
+                self.operands_count = Counter(self.operands)
+            if other.operands_count is None:
+                other.operands_count = Counter(other.operands)
+            return self.operands_count == other.operands_count
 
     def __hash__(self) -> int:
         """ Hash the ArithmeticOperation.
@@ -3564,7 +4236,11 @@ class ArithmeticOperation(SimpleExpression):
         int
             Hash of the ArithmeticOperation.
         """
-        return hash((tuple(self.operands), self.operator))
+        if self.hash_value is None:
+            # Independent of the order of the operands, as the equality
+            self.hash_value = hash((self.hash_key, self.operator))
+
+        return self.hash_value
 
     def smtlib(self, k: int = None, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> str:
         """ Assert the ArithmeticOperation.
@@ -3583,10 +4259,9 @@ class ArithmeticOperation(SimpleExpression):
         str
             SMT-LIB format.
         """
-        smt_input = ' '.join(map(lambda operand: operand.smtlib(
-            k, delta=delta, saturated_delta=saturated_delta), self.operands))
+        smt_input = ' '.join([operand.smtlib(k, delta=delta, saturated_delta=saturated_delta) for operand in self.operands])
 
-        return "({} {})".format(self.operator, smt_input)
+        return f"({self.operator} {smt_input})"
 
     def generalize(self, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> SimpleExpression:
         """ Generalize the ArithmeticOperation from a delta vector.
@@ -3637,14 +4312,23 @@ class FreeVariable(SimpleExpression):
         An identifier.
     index : int
         Number of the FreeVariable.
+    smtlib_cache : dict of int: str
+        Memoized SMT-LIB identifiers (indexed by the order).
+    declare_cache : dict of int: str
+        Memoized SMT-LIB declarations (indexed by the order).
     """
 
+    __slots__ = ('id', 'index', 'smtlib_cache', 'declare_cache')
+
     def __init__(self, id: str, index: int) -> None:
         """ Initializer.
         """
         self.id: str = id
         self.index: int = index
 
+        self.smtlib_cache: dict[Optional[int], str] = {None: id}
+        self.declare_cache: dict[Optional[int], str] = {}
+
     def __str__(self) -> str:
         """ FreeVariable to textual format.
 
@@ -3653,14 +4337,14 @@ class FreeVariable(SimpleExpression):
         str
             Debugging format.
         """
-        return "k{}".format(self.index)
+        return f"k{self.index}"
 
-    def __eq__(self, other: Any) -> bool:
+    def __eq__(self, other: object) -> bool:
         """ Compare the FreeVariable for equality.
 
         Parameters
         ----------
-        other : any
+        other : object
             Other object to compare.
 
         Returns
@@ -3668,7 +4352,9 @@ class FreeVariable(SimpleExpression):
         bool
             Equality of the FreeVariable with other.
         """
-        if not isinstance(other, FreeVariable):
+        if self is other:
+            return True
+        elif type(other) is not FreeVariable:
             return NotImplemented
         else:
             return self.id == other.id
@@ -3700,7 +4386,27 @@ class FreeVariable(SimpleExpression):
         str
             SMT-LIB format.
         """
-        return self.id if k is None else "{}@{}".format(self.id, k)
+        return self.smtlib_plain(k)
+
+    def smtlib_plain(self, k: int = None) -> str:
+        """ Assert the FreeVariable (without delta).
+
+        Parameters
+        ----------
+        k : int, optional
+            Order.
+
+        Returns
+        -------
+        str
+            SMT-LIB format.
+        """
+        smt_input = self.smtlib_cache.get(k)
+        if smt_input is None:
+            smt_input = f"{self.id}@{k}"
+            self.smtlib_cache[k] = smt_input
+
+        return smt_input
 
     def smtlib_declare(self, k: Optional[int] = None) -> str:
         """ Declare the FreeVariable.
@@ -3710,10 +4416,13 @@ class FreeVariable(SimpleExpression):
         str
             SMT-LIB format.
         """
-        if k is None:
-            return "(declare-const {} Int)\n(assert (>= {} 0))\n".format(self.id, self.id)
-        else:
-            return "(declare-const {}@{} Int)\n(assert (>= {}@{} 0))\n".format(self.id, k, self.id, k)
+        smt_input = self.declare_cache.get(k)
+        if smt_input is None:
+            identifier = self.smtlib_plain(k)
+            smt_input = f"(declare-const {identifier} Int)\n(assert (>= {identifier} 0))\n"
+            self.declare_cache[k] = smt_input
+
+        return smt_input
 
     def generalize(self, delta: Optional[dict[Place, int]] = None, saturated_delta: Optional[dict[Place, list[Expression]]] = None) -> SimpleExpression:
         """ Generalize the FreeVariable from a delta vector.
@@ -3749,3 +4458,86 @@ class FreeVariable(SimpleExpression):
 
     def normal_form_hash(self, negation: bool = False) -> str:
         raise NotImplementedError
+
+
+
+class BooleanOperator:
+    """ Boolean operator (shared by the StateFormulas).
+
+    Attributes
+    ----------
+    name : str
+        Operator (not, and, or).
+    negation : str, optional
+        Dual operator (None for negations).
+    reducer : Callable, optional
+        Evaluation of the operands (`all` for conjunctions, `any` for disjunctions, None for negations).
+    minizinc_walk_separator : str
+        Separator of the operands (MiniZinc and .ltl formats).
+    """
+
+    __slots__ = ('name', 'negation', 'reducer', 'minizinc_walk_separator')
+
+    def __init__(self, name: str) -> None:
+        """ Initializer.
+
+        Parameters
+        ----------
+        name : str
+            Operator (not, and, or).
+        """
+        self.name: str = name
+        self.negation: Optional[str] = NEGATION_BOOLEAN_OPERATORS.get(name)
+        self.reducer: Optional[Callable[[Iterable[bool]], bool]] = BOOLEAN_OPERATORS_TO_REDUCERS.get(name)
+
+        self.minizinc_walk_separator: str = ' '
+        if name in BOOLEAN_OPERATORS_TO_MINIZINC_WALK:
+            self.minizinc_walk_separator = f' {BOOLEAN_OPERATORS_TO_MINIZINC_WALK[name]} '
+
+
+class ComparisonOperator:
+    """ Comparison operator (shared by the Atoms).
+
+    Attributes
+    ----------
+    name : str
+        Operator (=, <=, >=, <, >, distinct).
+    negation : str
+        Negated operator.
+    commutation : str
+        Operator after swapping the operands.
+    walk : str
+        .ltl format.
+    comparator : Callable
+        Comparison function.
+    smtlib_template : str
+        SMT-LIB format with the operator filled in.
+    """
+
+    __slots__ = ('name', 'negation', 'commutation', 'walk', 'comparator', 'smtlib_template')
+
+    def __init__(self, name: str) -> None:
+        """ Initializer.
+
+        Parameters
+        ----------
+        name : str
+            Operator (=, <=, >=, <, >, distinct).
+        """
+        self.name: str = name
+        self.negation: str = NEGATION_COMPARISON_OPERATORS[name]
+        self.commutation: str = COMMUTATION_COMPARISON_OPERATORS[name]
+        self.walk: str = COMPARISON_OPERATORS_TO_WALK[name]
+        self.comparator: Callable[[int, int], bool] = TRANSLATION_COMPARISON_OPERATORS[name]
+        self.smtlib_template: str = f"({name} {{}} {{}})"
+
+
+# Operators
+BOOLEAN_OPERATORS = {operator: BooleanOperator(operator) for operator in ('not', 'and', 'or')}
+COMPARISON_OPERATORS = {operator: ComparisonOperator(operator) for operator in TRANSLATION_COMPARISON_OPERATORS}
+
+# Interned constants
+TRUE = BooleanConstant(True)
+FALSE = BooleanConstant(False)
+
+INTEGER_CONSTANTS: dict[int, IntegerConstant] = {}
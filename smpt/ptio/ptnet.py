@@ -27,10 +27,11 @@ __contact__ = "namat@laas.fr"
 __license__ = "GPLv3"
 __version__ = "5.0"
 
-from re import split
-from sys import exit
-from typing import Optional
-from xml.etree.ElementTree import parse, register_namespace
+from itertools import accumulate, repeat
+from operator import add, ge, itemgetter, sub
+from sys import exit, intern
+from typing import Callable, Iterator, Optional, TextIO
+from xml.etree.ElementTree import Element, iterparse, register_namespace
 
 MULTIPLIER_TO_INT = {
     'K': 1000,
@@ -41,6 +42,33 @@ MULTIPLIER_TO_INT = {
     'E': 1000000000000000000
 }
 
+# '#' and ',' forbidden in SMT-LIB
+SMTLIB_FORBIDDEN_CHARACTERS = str.maketrans('#,', '..')
+
+# '{' and '}' forbidden in SMT-LIB (deleted)
+SMTLIB_FORBIDDEN_BRACES = str.maketrans('', '', '{}')
+
+# Parentheses around initial markings (deleted)
+MARKING_PARENTHESES = str.maketrans('', '', '()')
+
+# Read buffer for .net files (1 MiB)
+NET_BUFFER_SIZE = 1 << 20
+
+# Placeholders of the orders k and k + 1 in transition skeletons (whitespace, never part of an identifier)
+SMTLIB_CURRENT_ORDER, SMTLIB_NEXT_ORDER = '\v', '\f'
+
+# PNML namespace and tags (namespaced once)
+PNML_NAMESPACE = "http://www.pnml.org/version-2009/grammar/pnml"
+PNML_XMLNS = "{" + PNML_NAMESPACE + "}"
+PNML_PLACE, PNML_TRANSITION, PNML_ARC = PNML_XMLNS + 'place', PNML_XMLNS + 'transition', PNML_XMLNS + 'arc'
+PNML_NAME_TEXT = PNML_XMLNS + 'name/' + PNML_XMLNS + 'text'
+
+# Path to the NUPN toolspecific structure
+PNML_NUPN_STRUCTURE = PNML_XMLNS + 'structure'
+PNML_NUPN_STRUCTURE_PARENTS = [PNML_XMLNS + 'pnml', PNML_XMLNS + 'net', PNML_XMLNS + 'page', PNML_XMLNS + 'toolspecific']
+PNML_NUPN_UNIT, PNML_NUPN_PLACES, PNML_NUPN_SUBUNITS = PNML_XMLNS + 'unit', PNML_XMLNS + 'places', PNML_XMLNS + 'subunits'
+PNML_NUPN_UNIT_PARENTS = PNML_NUPN_STRUCTURE_PARENTS + [PNML_NUPN_STRUCTURE]
+
 
 class PetriNet:
     """ Petri net.
@@ -77,6 +105,24 @@ class PetriNet:
         Correspondence of the transition ids with the names (.pnml).
     nupn : NUPN, optional
         NUPN flag.
+    places_by_xml_name : dict of str: list of Place
+        Places referenced by a name from a property (.xml format), after SMT-LIB translation.
+    transitions_by_xml_name : dict of str: list of Transition
+        Transitions referenced by a name from a property (.xml format), after SMT-LIB translation.
+    transition_relations : dict of (int, bool, bool): str
+        Memoized transition relations (indexed by the order and the `eq` and `tr` flags).
+    transitions_by_delta : dict of frozenset of (Place, int): list of Transition, optional
+        Transitions grouped by delta vector (built on first use).
+    marking_getter : itemgetter, optional
+        Getter of the token counts of all the places in the order of the net (built on first use, at least two places).
+    frame_template : str, optional
+        Frame axioms of all the places with order placeholders (built on first use).
+    frame_lengths : list of int, optional
+        Length of the frame axiom of each place, orders excluded (built on first use).
+    places_declarations : dict of bool: str
+        Declarations of the places with an order placeholder (indexed by the `non_negative` flag, built on first use).
+    parsed_arcs : dict of str: (Place, int)
+        Arcs already parsed, by .net token (emptied after parsing).
     """
 
     def __init__(self, filename: str, pnml_filename: str = None, skeleton: bool = False, colored: bool = False, state_equation: bool = False, parikh: bool = False) -> None:
@@ -138,9 +184,23 @@ class PetriNet:
             if self.nupn.root is None:
                 self.nupn = None
 
-        # Parse the `.net` file
+        # Parse the `.net` file (arcs memoized by token while parsing)
+        self.parsed_arcs: dict[str, tuple[Place, int]] = {}
         self.parse_net(filename)
 
+        # Name tables used by the `.xml` properties parser
+        self.places_by_xml_name: dict[str, list[Place]] = {}
+        self.transitions_by_xml_name: dict[str, list[Transition]] = {}
+        self.xml_names_mapping()
+
+        # The net is not modified after parsing
+        self.transition_relations: dict[tuple[int, bool, bool], str] = {}
+        self.transitions_by_delta: Optional[dict[frozenset[tuple[Place, int]], list[Transition]]] = None
+        self.marking_getter: Optional[itemgetter] = None
+        self.places_declarations: dict[bool, str] = {}
+        self.frame_template: Optional[str] = None
+        self.frame_lengths: Optional[list[int]] = None
+
     def __str__(self) -> str:
         """ Petri net to .net format.
 
@@ -149,11 +209,7 @@ class PetriNet:
         str
             .net format.
         """
-        text = "net {}\n".format(self.id)
-        text += ''.join(map(str, self.places.values()))
-        text += ''.join(map(str, self.transitions.values()))
-
-        return text
+        return f"net {self.id}\n" + ''.join(map(str, self.places.values())) + ''.join(map(str, self.transitions.values()))
 
     def smtlib_declare_places(self, k: Optional[int] = None, non_negative: bool = True) -> str:
         """ Declare places.
@@ -170,7 +226,18 @@ class PetriNet:
         str
             SMT-LIB format.
         """
-        return ''.join(map(lambda pl: pl.smtlib_declare(k, non_negative=non_negative), self.places.values()))
+        # Declarations rendered once with an order placeholder, then specialized in a single pass
+        declarations = self.places_declarations.get(non_negative)
+        if declarations is None:
+            placeholder = '@' + SMTLIB_CURRENT_ORDER
+            if non_negative:
+                declarations = ''.join([f"(declare-const {pl.id}{placeholder} Int)\n(assert (>= {pl.id}{placeholder} 0))\n" for pl in self.places.values()])
+            else:
+                declarations = ''.join([f"(declare-const {pl.id}{placeholder} Int)\n" for pl in self.places.values()])
+            self.places_declarations[non_negative] = declarations
+
+        # Order suffix (see `Place.smtlib`)
+        return declarations.replace('@' + SMTLIB_CURRENT_ORDER, f"@{k}" if k is not None else '')
 
     def minizinc_declare_places(self) -> str:
         """ Declare places.
@@ -228,30 +295,114 @@ class PetriNet:
         -------
         str
             SMT-LIB format.
+
+        Note
+        ----
+        The transition relation is memoized for each order and flags.
         """
-        smt_input = ""
+        key = (k, eq, tr)
+        if key not in self.transition_relations:
+            self.transition_relations[key] = ''.join(self.iter_transition_relation(k, eq=eq, tr=tr))
+
+        return self.transition_relations[key]
 
+    def write_transition_relation(self, write: Callable[[str], None], k: int, eq: bool = True, tr: bool = False) -> None:
+        """ Write the transition relation from places at order k to order k + 1, fragment by fragment.
+
+        Parameters
+        ----------
+        write : Callable[[str], None]
+            Output (e.g. the `write` method of a solver).
+        k : int
+            Order.
+        eq : bool, optional
+            Add EQ(p_k, p_{k+1}) predicate in the transition relation.
+        tr : bool, optional
+            Add transition ids.
+
+        Note
+        ----
+        Intended for relations written once (unrollings), the relation is neither materialized nor memoized.
+        Each transition is passed to `write` as it is rendered (the Z3 interface buffers at most `SOLVER_BUFFER_SIZE` bytes).
+        A relation already memoized by `smtlib_transition_relation` is written as is.
+        """
+        key = (k, eq, tr)
+        if key in self.transition_relations:
+            write(self.transition_relations[key])
+            return
+
+        for smt_input in self.iter_transition_relation(k, eq=eq, tr=tr):
+            write(smt_input)
+
+    def iter_transition_relation(self, k: int, eq: bool = True, tr: bool = False) -> Iterator[str]:
+        """ Generate the transition relation from places at order k to order k + 1.
+
+        Parameters
+        ----------
+        k : int
+            Order.
+        eq : bool, optional
+            Add EQ(p_k, p_{k+1}) predicate in the transition relation.
+        tr : bool, optional
+            Add transition ids.
+
+        Returns
+        -------
+        Iterator of str
+            SMT-LIB format fragments (one per transition).
+        """
         if not self.places:
-            return smt_input
+            return
+
+        # Frame axioms EQ(p_k, p_{k+1}) formatted once, shared by all the transitions
+        frame_block, frame_spans = self.smtlib_frame_axioms(k)
 
         if tr:
-            smt_input += "(declare-const TRACE@{} Int)\n".format(k)
+            yield f"(declare-const TRACE@{k} Int)\n"
 
-        smt_input += "(assert (or \n"
+        yield "(assert (or \n"
+
+        for index, transition in enumerate(self.transitions.values()):
+            yield transition.smtlib(k, id=index if tr else None, frame_block=frame_block, frame_spans=frame_spans)
 
-        if tr:
-            smt_input += ''.join(map(lambda it: it[1].smtlib(k, id=it[0]), enumerate(self.transitions.values())))
-        else:
-            smt_input += ''.join(map(lambda tr: tr.smtlib(k), self.transitions.values()))
         if eq:
-            smt_input += "\t(and\n\t\t"
+            yield "\t(and\n\t\t"
             if tr:
-                smt_input += "(= TRACE@{} (-1))\n\t\t".format(k)
-            smt_input += ''.join(map(lambda pl: "(= {}@{} {}@{})".format(pl.id, k + 1, pl.id, k), self.places.values()))
-            smt_input += "\n\t)"
-        smt_input += "\n))\n"
+                yield f"(= TRACE@{k} (-1))\n\t\t"
+            yield frame_block
+            yield "\n\t)"
 
-        return smt_input
+        yield "\n))\n"
+
+    def smtlib_frame_axioms(self, k: int) -> tuple[str, dict[Place, tuple[int, int]]]:
+        """ Frame axioms EQ(p_k, p_{k+1}) of all the places.
+
+        Parameters
+        ----------
+        k : int
+            Order.
+
+        Returns
+        -------
+        str
+            Frame axioms of all the places (SMT-LIB format).
+        dict of Place: (int, int)
+            Span of the frame axiom of each place in the block.
+        """
+        # Axioms rendered once with order placeholders (identifiers formatted a single time)
+        if self.frame_template is None:
+            frame_axioms = [f"(= {pl.id}@{SMTLIB_NEXT_ORDER} {pl.id}@{SMTLIB_CURRENT_ORDER})" for pl in self.places.values()]
+            self.frame_template = ''.join(frame_axioms)
+            self.frame_lengths = [len(frame_axiom) - 2 for frame_axiom in frame_axioms]
+
+        current_order, next_order = str(k), str(k + 1)
+        frame_block = self.frame_template.replace(SMTLIB_CURRENT_ORDER, current_order).replace(SMTLIB_NEXT_ORDER, next_order)
+
+        # Spans computed from the lengths, each axiom grows by the length of both orders
+        ends = list(accumulate(map(add, self.frame_lengths, repeat(len(current_order) + len(next_order)))))
+        frame_spans = dict(zip(self.places.values(), zip([0] + ends, ends)))
+
+        return frame_block, frame_spans
 
     def smtlib_state_equation(self, k: Optional[int] = None, parikh: bool = False) -> str:
         """ Assert the state equation (potentially reachable markings).
@@ -268,6 +419,26 @@ class PetriNet:
         """
         return ''.join(map(lambda pl: pl.smtlib_state_equation(k, parikh), self.places.values()))
 
+    def write_state_equation(self, write: Callable[[str], None], k: Optional[int] = None, parikh: bool = False) -> None:
+        """ Write the state equation, place by place.
+
+        Parameters
+        ----------
+        write : Callable[[str], None]
+            Output (e.g. the `write` method of a solver).
+        k : int, optional
+            Order.
+        parikh : bool, optional
+            Computation of parikh vector enabled.
+
+        Note
+        ----
+        The equation is never materialized as a whole (see `smtlib_state_equation`),
+        each place is passed to `write` as it is rendered (the Z3 interface buffers at most `SOLVER_BUFFER_SIZE` bytes).
+        """
+        for pl in self.places.values():
+            write(pl.smtlib_state_equation(k, parikh))
+
     def smtlib_read_arc_constraints(self, parikh: bool = False) -> str:
         """ Assert read arc constraints.
 
@@ -282,6 +453,24 @@ class PetriNet:
         """
         return ''.join(map(lambda tr: tr.smtlib_read_arc_constraints(parikh), self.transitions.values()))
 
+    def write_read_arc_constraints(self, write: Callable[[str], None], parikh: bool = False) -> None:
+        """ Write read arc constraints, transition by transition.
+
+        Parameters
+        ----------
+        write : Callable[[str], None]
+            Output (e.g. the `write` method of a solver).
+        parikh : bool, optional
+            Computation of parikh vector enabled.
+
+        Note
+        ----
+        The constraints are never materialized as a whole (see `smtlib_read_arc_constraints`),
+        each transition is passed to `write` as it is rendered (the Z3 interface buffers at most `SOLVER_BUFFER_SIZE` bytes).
+        """
+        for tr in self.transitions.values():
+            write(tr.smtlib_read_arc_constraints(parikh))
+
     def smtlib_declare_trap(self) -> str:
         """ Declare trap Boolean variable for each place.
             
@@ -320,24 +509,54 @@ class PetriNet:
         filename : str
             PNML filename (.pnml format).
         """
-        xmlns = "{http://www.pnml.org/version-2009/grammar/pnml}"
+        # Streaming parse, nodes are cleared once mapped
+        for _, node in iterparse(filename):
+            if node.tag == PNML_PLACE:
+                mapping = self.pnml_places_mapping
+            elif node.tag == PNML_TRANSITION:
+                mapping = self.pnml_transitions_mapping
+            else:
+                continue
 
-        tree = parse(filename)
-        root = tree.getroot()
+            node_text = node.find(PNML_NAME_TEXT)
+            if node_text is not None:
+                mapping[node.attrib['id']] = node_text.text.translate(SMTLIB_FORBIDDEN_CHARACTERS)
 
-        for place_node in root.iter(xmlns + 'place'):
-            place_id = place_node.attrib['id']
-            place_text = place_node.find(xmlns + 'name/' + xmlns + 'text')
-            if place_text is not None:
-                place_name = place_text.text.replace('#', '.').replace(',', '.')  # '#' and ',' forbidden in SMT-LIB
-                self.pnml_places_mapping[place_id] = place_name
+            node.clear()
 
-        for transition_node in root.iter(xmlns + 'transition'):
-            transition_id = transition_node.attrib['id']
-            transition_text = transition_node.find(xmlns + 'name/' + xmlns + 'text')
-            if transition_text is not None:
-                transition_name = transition_text.text.replace('#', '.').replace(',', '.')  # '#' and ',' forbidden in SMT-LIB
-                self.pnml_transitions_mapping[transition_id] = transition_name
+    def xml_names_mapping(self) -> None:
+        """ Map the names used in `.xml` properties to places and transitions.
+
+        Note
+        ----
+        Colored names are mapped to their unfolded nodes, `.pnml` ids to the corresponding nodes,
+        and `.net` names to themselves. Keys are translated with `SMTLIB_FORBIDDEN_CHARACTERS`.
+        Names referencing unknown nodes are left out, so that a lookup raises a `KeyError`.
+        """
+        if self.colored:
+            places_mapping = self.colored_places_mapping
+            transitions_mapping = self.colored_transitions_mapping
+        elif self.pnml_mapping:
+            places_mapping = {pl_id: [pl] for pl_id, pl in self.pnml_places_mapping.items()}
+            transitions_mapping = {tr_id: [tr] for tr_id, tr in self.pnml_transitions_mapping.items()}
+        else:
+            # `.net` names (already translated) map to themselves, no lookup needed
+            self.places_by_xml_name = {pl_id: [pl] for pl_id, pl in self.places.items()}
+            self.transitions_by_xml_name = {tr_id: [tr] for tr_id, tr in self.transitions.items()}
+            return
+
+        # Single lookup per node (unknown nodes found as None)
+        get_place, get_transition = self.places.get, self.transitions.get
+
+        for name, places in places_mapping.items():
+            nodes = [get_place(pl) for pl in places]
+            if None not in nodes:
+                self.places_by_xml_name[name.translate(SMTLIB_FORBIDDEN_CHARACTERS)] = nodes
+
+        for name, transitions in transitions_mapping.items():
+            nodes = [get_transition(tr) for tr in transitions]
+            if None not in nodes:
+                self.transitions_by_xml_name[name.translate(SMTLIB_FORBIDDEN_CHARACTERS)] = nodes
 
     def parse_net(self, filename: str) -> None:
         """ Petri net parser.
@@ -352,44 +571,95 @@ class PetriNet:
         FileNotFoundError
             Petri net file not found.
         """
+        # Parser of each kind of element (first identifier of a line), bound once outside of the loop
+        get_parser = {
+            '.': self.parse_colored_mapping,
+            'net': self.parse_id,
+            'tr': self.parse_transition,
+            'pl': self.parse_place
+        }.get
+
         try:
-            with open(filename, 'r') as fp:
-                for line in fp.readlines():
+            with open(filename, 'r', buffering=NET_BUFFER_SIZE) as fp:
+                for line in self.read_lines(fp):
 
-                    # '#' and ',' forbidden in SMT-LIB
-                    content = split(r'\s+', line.strip().replace('#', '.').replace(',', '.'))
+                    # Whitespace split in C
+                    content = line.split()
 
                     # Skip empty lines and get the first identifier
                     if not content:
                         continue
-                    else:
-                        element = content.pop(0)
-
-                    # Colored Petri net
-                    if element == '.':
-                        kind_mapping = content.pop(0)
-                        if kind_mapping == 'pl':
-                            colored_place = content.pop(0)
-                            self.colored_places_mapping[colored_place] = content
-                        if kind_mapping == 'tr':
-                            colored_transition = content.pop(0)
-                            self.colored_transitions_mapping[colored_transition] = content
-
-                    # Net id
-                    if element == "net":
-                        self.id = content[0].replace('{', '').replace('}', '')
-
-                    # Transition arcs
-                    if element == "tr":
-                        self.parse_transition(content)
-
-                    # Place
-                    if element == "pl":
-                        self.parse_place(content)
-            fp.close()
+
+                    parser = get_parser(content[0])
+                    if parser is not None:
+                        parser(content[1:])
         except FileNotFoundError as e:
             exit(e)
 
+        self.parsed_arcs.clear()
+
+    @staticmethod
+    def read_lines(fp: TextIO) -> Iterator[str]:
+        """ Read the lines of a .net file by blocks.
+
+        Parameters
+        ----------
+        fp : TextIO
+            Opened .net file.
+
+        Returns
+        -------
+        Iterator of str
+            Lines, with '#' and ',' translated.
+
+        Note
+        ----
+        The translation and the line split are done once per block of `NET_BUFFER_SIZE` characters,
+        rather than once per line.
+        """
+        remainder = ''
+
+        while True:
+            block = fp.read(NET_BUFFER_SIZE)
+            if not block:
+                break
+
+            # '#' and ',' forbidden in SMT-LIB (the last line may be incomplete)
+            lines = (remainder + block).translate(SMTLIB_FORBIDDEN_CHARACTERS).split('\n')
+            remainder = lines.pop()
+            yield from lines
+
+        if remainder:
+            yield remainder
+
+    def parse_colored_mapping(self, content: list[str]) -> None:
+        """ Colored mapping parser.
+
+        Parameters
+        ----------
+        content : list of str
+            Content to parse (.net format).
+        """
+        kind_mapping = content.pop(0)
+
+        if kind_mapping == 'pl':
+            colored_place = content.pop(0)
+            self.colored_places_mapping[colored_place] = content
+
+        elif kind_mapping == 'tr':
+            colored_transition = content.pop(0)
+            self.colored_transitions_mapping[colored_transition] = content
+
+    def parse_id(self, content: list[str]) -> None:
+        """ Net id parser.
+
+        Parameters
+        ----------
+        content : list of str
+            Content to parse (.net format).
+        """
+        self.id = content[0].translate(SMTLIB_FORBIDDEN_BRACES)
+
     def parse_transition(self, content: list[str]) -> None:
         """ Transition parser.
 
@@ -398,57 +668,55 @@ class PetriNet:
         content : list of string
             Content to parse (.net format).
         """
-        transition_id = content.pop(0).replace('{', '').replace('}', '')  # '{' and '}' forbidden in SMT-LIB
+        transition_id = content.pop(0).translate(SMTLIB_FORBIDDEN_BRACES)
 
-        if transition_id in self.transitions:
-            tr = self.transitions[transition_id]
-        else:
+        tr = self.transitions.get(transition_id)
+        if tr is None:
             tr = Transition(transition_id, self)
-            self.transitions[transition_id] = tr
+            self.transitions[tr.id] = tr
 
         content = self.parse_label(content)
         arrow = content.index("->")
 
-        for arc in content[0:arrow]:
-            tr.connected_places.add(self.parse_arc(arc, tr.pre))
-
-        for arc in content[arrow + 1:]:
-            tr.connected_places.add(self.parse_arc(arc, tr.post))
+        # Arcs added in two batches (inputs, then outputs), then the connected places at once
+        # (tokens already parsed are found without calling the arc parser)
+        get_arc, parse_arc = self.parsed_arcs.get, self.parse_arc
+        tr.pre.update([get_arc(arc) or parse_arc(arc) for arc in content[:arrow]])
+        tr.post.update([get_arc(arc) or parse_arc(arc) for arc in content[arrow + 1:]])
+        tr.connected_places.update(tr.pre, tr.post)
 
         tr.normalize(self.state_equation)
 
-    def parse_arc(self, content: str, arcs: dict[Place, int]) -> Place:
+    def parse_arc(self, content: str) -> tuple[Place, int]:
         """ Arc parser.
     
         Parameters
         ----------
-        content : 
+        content : str
             Content to parse (.net format).
-        arcs : dict of Place: int
-            Current arcs.
 
         Returns
         -------
+        tuple of Place, int
+            Connected place and weight.
 
+        Note
+        ----
+        Arcs are memoized by token (see `parsed_arcs`), as the same place and weight occur in many transitions.
         """
-        content = content.replace('{', '').replace('}', '')  # '{' and '}' forbidden in SMT-LIB
-
-        if '*' in content:
-            place_id, _, weight_str = content.partition('*')
-            weight = self.parse_value(weight_str)
-        else:
-            place_id = content
-            weight = 1
-
-        if place_id not in self.places:
-            new_place = Place(place_id)
-            self.places[place_id] = new_place
-            self.initial_marking.tokens[new_place] = 0
+        # Place id and optional weight in a single scan
+        place_id, star, weight_str = content.translate(SMTLIB_FORBIDDEN_BRACES).partition('*')
+        weight = self.parse_value(weight_str) if star else 1
 
         pl = self.places.get(place_id)
-        arcs[pl] = weight
+        if pl is None:
+            pl = Place(place_id)
+            self.places[pl.id] = pl
+            self.initial_marking.tokens[pl] = 0
+
+        arc = self.parsed_arcs[content] = (pl, weight)
 
-        return pl
+        return arc
 
     def parse_place(self, content: list[str]) -> None:
         """ Place parser.
@@ -458,22 +726,20 @@ class PetriNet:
         content : list of str
             Place to parse (.net format).
         """
-        place_id = content.pop(0).replace('{', '').replace(
-            '}', '')  # '{' and '}' forbidden in SMT-LIB
+        place_id = content.pop(0).translate(SMTLIB_FORBIDDEN_BRACES)
 
         content = self.parse_label(content)
 
         if content:
-            initial_marking = self.parse_value(
-                content[0].replace('(', '').replace(')', ''))
+            initial_marking = self.parse_value(content[0].translate(MARKING_PARENTHESES))
         else:
             initial_marking = 0
 
-        if place_id not in self.places:
+        place = self.places.get(place_id)
+        if place is None:
             place = Place(place_id, initial_marking)
-            self.places[place_id] = place
+            self.places[place.id] = place
         else:
-            place = self.places.get(place_id)
             place.initial_marking = initial_marking
 
         self.initial_marking.tokens[place] = initial_marking
@@ -492,14 +758,16 @@ class PetriNet:
             Content without labels.
 
         """
-        index = 0
-        if content and content[index] == ':':
-            label_skipped = content[index + 1][0] != '{'
-            index = 2
-            while not label_skipped:
-                label_skipped = content[index][-1] == '}'
-                index += 1
-        return content[index:]
+        if not content or content[0] != ':':
+            return content
+
+        # Label as a single identifier
+        if content[1][0] != '{':
+            return content[2:]
+
+        # Braced label, possibly spread over several tokens (ends with the first token closing it)
+        end = next(index for index in range(1, len(content)) if content[index][-1] == '}')
+        return content[end + 1:]
 
     def parse_value(self, content: str) -> int:
         """ Parse integer value.
@@ -523,12 +791,13 @@ class PetriNet:
         if content.isnumeric():
             return int(content)
 
-        multiplier = content[-1]
+        # Single lookup of the suffix multiplier
+        multiplier = MULTIPLIER_TO_INT.get(content[-1:])
 
-        if multiplier not in MULTIPLIER_TO_INT:
+        if multiplier is None:
             raise ValueError("Incorrect integer value")
 
-        return int(content[:-1]) * MULTIPLIER_TO_INT[multiplier]
+        return int(content[:-1]) * multiplier
 
     def get_transition_from_step(self, m_1: Marking, m_2: Marking) -> Optional[Transition]:
         """ Return an associate transition to a step m_1 -> m_2.
@@ -545,16 +814,28 @@ class PetriNet:
         Transitions, optional
             Transition corresponding to the step.
         """
-        # Get delta
-        delta = {}
-        for place in self.places.values():
-            place_delta = m_2.tokens[place] - m_1.tokens[place]
-            if place_delta:
-                delta[place] = place_delta
+        # Read both markings as vectors of token counts, in the order of the net (single C call per marking)
+        places = self.places.values()
+        if self.marking_getter is None and len(self.places) > 1:
+            self.marking_getter = itemgetter(*places)
+
+        if self.marking_getter is not None:
+            tokens_1, tokens_2 = self.marking_getter(m_1.tokens), self.marking_getter(m_2.tokens)
+        else:
+            tokens_1, tokens_2 = map(m_1.tokens.__getitem__, places), map(m_2.tokens.__getitem__, places)
+
+        # Get delta (differences computed in C, zeros dropped)
+        delta = {place: place_delta for place, place_delta in zip(places, map(sub, tokens_2, tokens_1)) if place_delta}
+
+        # Index the transitions by delta vector (kept in the order of the net)
+        if self.transitions_by_delta is None:
+            self.transitions_by_delta = {}
+            for transition in self.transitions.values():
+                self.transitions_by_delta.setdefault(frozenset(transition.delta.items()), []).append(transition)
 
-        # Return the corresponding transition
-        for transition in self.transitions.values():
-            if transition.delta == delta and all(m_1.tokens[place] >= pre for place, pre in transition.pre.items()):
+        # Return the corresponding transition among the ones with the same delta
+        for transition in self.transitions_by_delta.get(frozenset(delta.items()), ()):
+            if transition.is_fireable(m_1):
                 return transition
 
         return None
@@ -580,6 +861,8 @@ class Place:
     ----------
     id : str
         An identifier.
+    walk_id : str
+        Identifier in .ltl format (braced if it contains '-' or '.').
     initial_marking : Marking
         Initial marking of the place.
     delta : dict of Transition: int
@@ -588,8 +871,12 @@ class Place:
         Input transitions.
     output_transitions : set of Transition 
         Output transitions.
+    identifiers : dict of int: str
+        Identifiers at each order (formatted on first use).
     """
 
+    __slots__ = ('id', 'walk_id', 'initial_marking', 'delta', 'input_transitions', 'output_transitions', 'identifiers')
+
     def __init__(self, place_id: str, initial_marking: int = 0) -> None:
         """ Initializer.
 
@@ -600,7 +887,8 @@ class Place:
         initial_marking : int, optional
             Initial marking of the place.
         """
-        self.id: str = place_id
+        self.id: str = intern(place_id)
+        self.walk_id: str = f"{{{place_id}}}" if '-' in place_id or '.' in place_id else self.id
         self.initial_marking: int = initial_marking
 
         # Optional (used for state equation)
@@ -608,6 +896,8 @@ class Place:
         self.input_transitions: set[Transition] = set()
         self.output_transitions: set[Transition] = set()
 
+        self.identifiers: dict[int, str] = {}
+
     def __str__(self) -> str:
         """ Place to .net format.
 
@@ -617,7 +907,7 @@ class Place:
             .net format.
         """
         if self.initial_marking:
-            return "pl {} ({})\n".format(self.id, self.initial_marking)
+            return f"pl {self.id} ({self.initial_marking})\n"
         else:
             return ""
 
@@ -634,7 +924,15 @@ class Place:
         str
             SMT-LIB format.
         """
-        return "{}@{}".format(self.id, k) if k is not None else self.id
+        if k is None:
+            return self.id
+
+        # Memoized for each order
+        identifier = self.identifiers.get(k)
+        if identifier is None:
+            identifier = self.identifiers[k] = f"{self.id}@{k}"
+
+        return identifier
 
     def smtlib_declare(self, k: Optional[int] = None, non_negative: bool = True) -> str:
         """ Declare a place.
@@ -651,7 +949,8 @@ class Place:
         str
             SMT-LIB format.
         """
-        return "(declare-const {} Int)\n(assert (>= {} 0))\n".format(self.smtlib(k), self.smtlib(k)) if non_negative else "(declare-const {} Int)\n".format(self.smtlib(k))
+        identifier = self.smtlib(k)
+        return f"(declare-const {identifier} Int)\n(assert (>= {identifier} 0))\n" if non_negative else f"(declare-const {identifier} Int)\n"
 
     def minizinc_declare(self) -> str:
         """ Declare a place.
@@ -661,7 +960,7 @@ class Place:
         str
             MiniZinc format.
         """
-        return "var 0..MAX: {};\n".format(self.id)
+        return f"var 0..MAX: {self.id};\n"
 
     def smtlib_initial_marking(self, k: Optional[int] = None) -> str:
         """ Assert the initial marking.
@@ -676,7 +975,7 @@ class Place:
         str
             SMT-LIB format.
         """
-        return "(assert (= {} {}))\n".format(self.smtlib(k), self.initial_marking)
+        return f"(assert (= {self.smtlib(k)} {self.initial_marking}))\n"
 
     def smtlib_state_equation(self, k: Optional[int] = None, parikh: bool = False) -> str:
         """ Assert the state equation.
@@ -691,19 +990,19 @@ class Place:
         str
             SMT-LIB format.
         """
-        smt_input = ' '.join(["(* {} {})".format(tr.id + "@t" if parikh else tr.id, weight) if weight !=
-                             1 else tr.id + "@t" if parikh else tr.id for tr, weight in self.delta.items()])
+        suffix = "@t" if parikh else ''
+        smt_input = ' '.join([f"(* {tr.id}{suffix} {weight})" if weight != 1 else f"{tr.id}{suffix}" for tr, weight in self.delta.items()])
 
         if self.initial_marking != 0:
             smt_input += " " + str(self.initial_marking)
 
         if self.initial_marking != 0 or len(self.delta) > 1:
-            smt_input = "(+ {})".format(smt_input)
+            smt_input = f"(+ {smt_input})"
 
         if not smt_input:
             smt_input = "0"
 
-        return "(assert (= {} {}))\n".format(self.smtlib(k), smt_input)
+        return f"(assert (= {self.smtlib(k)} {smt_input}))\n"
 
     def smtlib_declare_trap(self) -> str:
         """ Declare trap Boolean variable.
@@ -713,7 +1012,7 @@ class Place:
         str
             SMT-LIB format.
         """
-        return "(declare-const {} Bool)\n".format(self.id)
+        return f"(declare-const {self.id} Bool)\n"
 
     def smtlib_trap_definition(self) -> str:
         """ Assert trap definition for each place.
@@ -729,9 +1028,9 @@ class Place:
         smt_input = ' '.join(map(lambda tr: tr.smtlib_trap_definition_helper(), self.output_transitions))
 
         if len(self.output_transitions) > 1:
-            smt_input = "(and {})".format(smt_input)
+            smt_input = f"(and {smt_input})"
 
-        return "(assert (=> {} {}))\n".format(self.id, smt_input)
+        return f"(assert (=> {self.id} {smt_input}))\n"
 
 
 class Transition:
@@ -751,8 +1050,14 @@ class Transition:
         Set of the places connected to the transition.
     ptnet: PetriNet
         Associated Petri net.
+    smtlib_skeleton: str, optional
+        Order-independent firing condition and updates (built on the first encoding).
+    sorted_connected_places: tuple of Place, optional
+        Connected places, in the order of the net (built on the first encoding).
     """
 
+    __slots__ = ('id', 'pre', 'post', 'delta', 'connected_places', 'ptnet', 'smtlib_skeleton', 'sorted_connected_places')
+
     def __init__(self, transition_id: str, ptnet: PetriNet) -> None:
         """ Initializer.
 
@@ -763,7 +1068,7 @@ class Transition:
         ptnet : PetriNet
             Associated Petri net.
         """
-        self.id: str = transition_id
+        self.id: str = intern(transition_id)
 
         self.pre: dict[Place, int] = {}
         self.post: Optional[dict[Place, int]] = {}
@@ -772,6 +1077,9 @@ class Transition:
         self.connected_places: set[Place] = set()
         self.ptnet: PetriNet = ptnet
 
+        self.smtlib_skeleton: Optional[str] = None
+        self.sorted_connected_places: Optional[tuple[Place, ...]] = None
+
     def __str__(self) -> str:
         """ Transition to textual format.
         
@@ -780,20 +1088,15 @@ class Transition:
         str
             .net format.
         """
-        text = "tr {} ".format(self.id)
-
-        for src, weight in self.pre.items():
-            text += ' ' + self.str_arc(src, weight)
-
-        text += ' ->'
+        inputs = ''.join([' ' + self.str_arc(src, weight) for src, weight in self.pre.items()])
 
+        outputs = []
         for place in self.connected_places:
             weight = self.delta.get(place, 0) + self.pre.get(place, 0)
             if weight:
-                text += ' ' + self.str_arc(place, weight)
+                outputs.append(' ' + self.str_arc(place, weight))
 
-        text += '\n'
-        return text
+        return f"tr {self.id} {inputs} ->{''.join(outputs)}\n"
 
     def str_arc(self, place: Place, weight: int) -> str:
         """ Arc to textual format.
@@ -810,14 +1113,9 @@ class Transition:
         str
             .net format.
         """
-        text = place.id
-
-        if weight > 1:
-            text += '*' + str(weight)
-
-        return text
+        return f"{place.id}*{weight}" if weight > 1 else place.id
 
-    def smtlib(self, k: int, id: Optional[int] = None) -> str:
+    def smtlib(self, k: int, id: Optional[int] = None, frame_block: Optional[str] = None, frame_spans: Optional[dict[Place, tuple[int, int]]] = None) -> str:
         """ Transition relation from places at order k to order k + 1.
             
         Parameters
@@ -826,42 +1124,74 @@ class Transition:
             Order.
         id : int, optional
             Id of the transition.
+        frame_block : str, optional
+            Precomputed EQ(p_k, p_{k+1}) predicates of all the places (shared between transitions).
+        frame_spans : dict of Place: (int, int), optional
+            Span of the predicate of each place in `frame_block`.
 
         Returns
         -------
         str
             SMT-LIB format.
         """
-        smt_input = "\t(and\n\t\t"
+        if frame_block is None or frame_spans is None:
+            frame_block, frame_spans = self.ptnet.smtlib_frame_axioms(k)
+
+        if self.smtlib_skeleton is None:
+            self.build_smtlib_skeleton(frame_spans)
+
+        # Fragments joined once at the end
+        smt_input = ["\t(and\n\t\t"]
 
         # Trace label
         if id is not None:
-            smt_input += "(= TRACE@{} {})\n\t\t".format(k, id)
+            smt_input.append(f"(= TRACE@{k} {id})\n\t\t")
 
-        # Firing condition on input places
-        for pl, weight in self.pre.items():
-            smt_input += "(>= {}@{} {})".format(pl.id, k, weight)
-        smt_input += "\n\t\t"
+        # Firing condition on input places and update of the connected places (skeleton specialized to the order k)
+        smt_input.append(self.smtlib_skeleton.replace(SMTLIB_CURRENT_ORDER, str(k)).replace(SMTLIB_NEXT_ORDER, str(k + 1)))
 
-        # Update input places
-        for pl in self.connected_places:
-            delta = self.delta.get(pl, 0)
-            if delta > 0:
-                smt_input += "(= {}@{} (+ {}@{} {}))".format(pl.id, k + 1, pl.id, k, delta)
-            elif delta < 0:
-                smt_input += "(= {}@{} (- {}@{} {}))".format(pl.id, k + 1, pl.id, k, -delta)
-            else:
-                smt_input += "(= {}@{} {}@{})".format(pl.id, k + 1, pl.id, k)
-        smt_input += "\n\t\t"
+        # Unconnected places must not be changed: slices of the frame block between the connected places
+        # (copied in C, no interpreted loop over all the places)
+        start = 0
+        for pl in self.sorted_connected_places:
+            span_start, span_end = frame_spans[pl]
+            smt_input.append(frame_block[start:span_start])
+            start = span_end
+        smt_input.append(frame_block[start:])
 
-        # Unconnected places must not be changed
-        for pl in self.ptnet.places.values():
-            if pl not in self.connected_places:
-                smt_input += "(= {}@{} {}@{})".format(pl.id, k + 1, pl.id, k)
+        smt_input.append("\n\t)\n")
 
-        smt_input += "\n\t)\n"
+        return ''.join(smt_input)
 
-        return smt_input
+    def build_smtlib_skeleton(self, frame_spans: dict[Place, tuple[int, int]]) -> None:
+        """ Build the order-independent part of the transition relation.
+
+        Parameters
+        ----------
+        frame_spans : dict of Place: (int, int)
+            Span of the frame axiom of each place (only their relative order is used).
+
+        Note
+        ----
+        Place identifiers and weights are formatted once,
+        the orders k and k + 1 are left as `SMTLIB_CURRENT_ORDER` and `SMTLIB_NEXT_ORDER` placeholders.
+        """
+        skeleton = [f"(>= {pl.id}@{SMTLIB_CURRENT_ORDER} {weight})" for pl, weight in self.pre.items()]
+        skeleton.append("\n\t\t")
+
+        delta = self.delta
+        for pl in self.connected_places:
+            pl_delta = delta.get(pl, 0)
+            if pl_delta > 0:
+                skeleton.append(f"(= {pl.id}@{SMTLIB_NEXT_ORDER} (+ {pl.id}@{SMTLIB_CURRENT_ORDER} {pl_delta}))")
+            elif pl_delta < 0:
+                skeleton.append(f"(= {pl.id}@{SMTLIB_NEXT_ORDER} (- {pl.id}@{SMTLIB_CURRENT_ORDER} {-pl_delta}))")
+            else:
+                skeleton.append(f"(= {pl.id}@{SMTLIB_NEXT_ORDER} {pl.id}@{SMTLIB_CURRENT_ORDER})")
+        skeleton.append("\n\t\t")
+
+        self.smtlib_skeleton = ''.join(skeleton)
+        self.sorted_connected_places = tuple(sorted(self.connected_places, key=frame_spans.__getitem__))
 
     def smtlib_declare(self, parikh: bool = False) -> str:
         """ Declare a transition.
@@ -877,7 +1207,7 @@ class Transition:
             SMT-LIB format.
         """
         identifier = self.id + "@t" if parikh else self.id
-        return "(declare-const {} Int)\n(assert (>= {} 0))\n".format(identifier, identifier)
+        return f"(declare-const {identifier} Int)\n(assert (>= {identifier} 0))\n"
 
     def smtlib_read_arc_constraints(self, parikh : bool = False) -> str:
         """ Assert read arc constraints.
@@ -892,23 +1222,24 @@ class Transition:
         str
             SMT-LIB format.
         """
-        smt_input = ""
+        smt_input = []
+        suffix = "@t" if parikh else ''
 
         # for p s.t. pre(t,p) > 0
         for pl, weight in self.pre.items():
             # if delta(t,p) = 0 and pre(t,p) > m0(p)
             if pl not in self.delta and weight > pl.initial_marking:
                 # t > 0 => \/_{t' s.t. post(t,p) > 0 \ t and delta(t',p) > 0} t' > 0
-                right_member = ["(> {} 0)".format(tr.id + "@t" if parikh else tr.id) for tr in pl.input_transitions if tr != self and tr.delta.get(pl, 0) > 0]
+                right_member = [f"(> {tr.id}{suffix} 0)" for tr in pl.input_transitions if tr != self and tr.delta.get(pl, 0) > 0]
                 if not right_member:
                     smt_input_right_member = "false"
                 elif len(right_member) == 1:
                     smt_input_right_member = ''.join(right_member)
                 else:
-                    smt_input_right_member = "(or {})".format(''.join(right_member))
-                smt_input += "(assert (=> (> {} 0) {}))\n".format(self.id + "@t" if parikh else self.id, smt_input_right_member)
+                    smt_input_right_member = f"(or {''.join(right_member)})"
+                smt_input.append(f"(assert (=> (> {self.id}{suffix} 0) {smt_input_right_member}))\n")
 
-        return smt_input
+        return ''.join(smt_input)
 
     def smtlib_trap_definition_helper(self) -> str:
         """ Helper to assert trap definition for each place.
@@ -927,10 +1258,26 @@ class Transition:
         smt_input = ' '.join(map(lambda pl: pl.id, post_places))
 
         if len(post_places) > 1:
-            smt_input = "(or {})".format(smt_input)
+            smt_input = f"(or {smt_input})"
 
         return smt_input
 
+    def is_fireable(self, m: Marking) -> bool:
+        """ Check the firing condition of the transition at a marking.
+
+        Parameters
+        ----------
+        m : Marking
+            Marking.
+
+        Returns
+        -------
+        bool
+            The transition is fireable at marking m.
+        """
+        # Token lookups and comparisons looped in C
+        return all(map(ge, map(m.tokens.__getitem__, self.pre.keys()), self.pre.values()))
+
     def normalize(self, state_equation: bool = False) -> None:
         """ Normalize arcs.
 
@@ -939,23 +1286,25 @@ class Transition:
         state_equation : bool, optional
             State equation method flag.
         """
-        for place in self.connected_places:
+        pre, post, delta = self.pre, self.post, self.delta
 
-            pre, post = self.pre.get(place, 0), self.post.get(place, 0)
-            delta = post - pre
-
-            if delta:
-                self.delta[place] = delta
+        # Single pass over the connected places, weights bound once
+        for place in self.connected_places:
+            place_delta = post.get(place, 0) - pre.get(place, 0)
+            if place_delta:
+                delta[place] = place_delta
 
-            if state_equation:
-                if pre:
+        # Flows of the places (state equation only, kept out of the loop above)
+        if state_equation:
+            for place, weight in pre.items():
+                if weight:
                     place.output_transitions.add(self)
-                if post:
+            for place, weight in post.items():
+                if weight:
                     place.input_transitions.add(self)
+            for place, place_delta in delta.items():
+                place.delta[self] = place_delta
 
-            if state_equation and delta:
-                place.delta[self] = delta
-            
         self.post = None
 
 
@@ -966,8 +1315,12 @@ class Marking:
     ----------
     tokens : dict of Place: int
         Number of tokens associated to the places.
+    marked_places : list of Place, optional
+        Places with at least one token (computed on first use).
     """
 
+    __slots__ = ('tokens', 'marked_places')
+
     def __init__(self, tokens: Optional[dict[Place, int]] = None) -> None:
         """ Initializer.
 
@@ -980,6 +1333,8 @@ class Marking:
             tokens = {}
         self.tokens: dict[Place, int] = tokens
 
+        self.marked_places: Optional[list[Place]] = None
+
     def __str__(self) -> str:
         """ Marking to textual format.
 
@@ -988,16 +1343,9 @@ class Marking:
         str
             .net format.
         """
-        text = ""
-
-        for place, marking in self.tokens.items():
-            if marking > 0:
-                text += " {}({})".format(str(place.id), marking)
+        text = ''.join([f" {place.id}({marking})" for place, marking in self.tokens.items() if marking > 0])
 
-        if text == "":
-            text = " empty marking"
-
-        return text
+        return text if text else " empty marking"
 
     def smtlib(self, k: int = None) -> str:
         """ Assert the marking.
@@ -1012,23 +1360,26 @@ class Marking:
         str
             SMT-LIB format.
         """
-        return ''.join(map(lambda pl: "(assert (= {} {}))\n".format(pl.smtlib(k), self.tokens[pl]), self.tokens.keys()))
+        # Order suffix formatted once for all the places (see `Place.smtlib`)
+        suffix = f"@{k}" if k is not None else ''
+
+        return ''.join([f"(assert (= {pl.id}{suffix} {tokens}))\n" for pl, tokens in self.tokens.items()])
 
     def smtlib_trap_initially_marked(self) -> str:
         """ Assert that places in the trap must be initially marked.
             SMT-LIB format
         """
-        marked_places = list(filter(lambda pl: self.tokens[pl] > 0, self.tokens))
+        marked_places = self.get_marked_places()
 
         if not marked_places:
             return "(assert false)\n"
 
-        smt_input = ' '.join(map(lambda pl: pl.id, marked_places))
+        smt_input = ' '.join([pl.id for pl in marked_places])
 
         if len(marked_places) > 1:
-            smt_input = "(or {})".format(smt_input)
+            smt_input = f"(or {smt_input})"
 
-        return "(assert {})\n".format(smt_input)
+        return f"(assert {smt_input})\n"
 
     def smtlib_consider_unmarked_places_for_trap(self) -> str:
         """ Consider unmarked places for trap candidates.
@@ -1038,12 +1389,24 @@ class Marking:
         str
             SMT-LIB format.
         """
-        marked_places = list(filter(lambda pl: self.tokens[pl] > 0, self.tokens))
+        return ''.join([f"(assert (not {pl.id}))\n" for pl in self.get_marked_places()])
 
-        if not marked_places:
-            return ""
+    def get_marked_places(self) -> list[Place]:
+        """ Places with at least one token.
 
-        return ''.join(map(lambda pl: "(assert (not {}))\n".format(pl.id), marked_places))
+        Returns
+        -------
+        list of Place
+            Marked places (in the order of the marking).
+
+        Note
+        ----
+        Computed once, the marking must not be modified afterwards.
+        """
+        if self.marked_places is None:
+            self.marked_places = [pl for pl, tokens in self.tokens.items() if tokens > 0]
+
+        return self.marked_places
 
 
 class NUPN:
@@ -1089,8 +1452,8 @@ class NUPN:
         """
         # Description
         text = "# NUPN\n"
-        text += "# Unit-safe: {}\n".format(self.unit_safe)
-        text += "# Root: {}\n".format(self.root.id)
+        text += f"# Unit-safe: {self.unit_safe}\n"
+        text += f"# Root: {self.root.id}\n"
 
         # Subunits
         text += '\n'.join(map(str, self.units.values()))
@@ -1115,15 +1478,7 @@ class NUPN:
         str
             SMT-LIB format.
         """
-        smt_input = ""
-
-        paths = self.root.compute_paths()
-
-        for path in paths:
-            if len(path) > 1:
-                smt_input += "(assert (<= (+ {}) 1))\n".format(' '.join(map(lambda unit: unit.id, path)))
-
-        return smt_input
+        return ''.join([f"(assert (<= (+ {' '.join([unit.id for unit in path])}) 1))\n" for path in self.root.compute_paths() if len(path) > 1])
 
     def parse_pnml(self, filename: str) -> None:
         """ Toolspecific section parser.
@@ -1133,44 +1488,61 @@ class NUPN:
         filename : str
             Petri net filename (.pnml format).
         """
-        xmlns = "{http://www.pnml.org/version-2009/grammar/pnml}"
-        register_namespace('', "http://www.pnml.org/version-2009/grammar/pnml")
+        register_namespace('', PNML_NAMESPACE)
 
-        tree = parse(filename)
-        root = tree.getroot()
-        # Check if the net is known to be unit-safe
-        structure = root.find(xmlns + "net/" + xmlns + "page/" + xmlns + "toolspecific/" + xmlns + "structure")
+        # Streaming parse up to the end of the `pnml/net/page/toolspecific/structure` node,
+        # places, transitions, arcs and units are cleared on the way
+        path = []
+        with open(filename, 'rb') as fp:
+            for event, node in iterparse(fp, events=('start', 'end')):
+                if event == 'start':
 
-        # Exit if no NUPN inforation
-        if structure is None:
-            return
+                    # Check if the net is known to be unit-safe (attributes available from the start)
+                    if node.tag == PNML_NUPN_STRUCTURE and path == PNML_NUPN_STRUCTURE_PARENTS:
 
-        # Get unit safe pragma
-        self.unit_safe = structure.attrib["safe"] == "true"
-        if not self.unit_safe:
-            return
+                        # Get unit safe pragma
+                        self.unit_safe = node.attrib["safe"] == "true"
+                        if not self.unit_safe:
+                            return
+
+                        # Get root unit
+                        self.root = self.get_unit(node.attrib["root"])
 
-        # Get root unit
-        self.root = self.get_unit(structure.attrib["root"])
+                    path.append(node.tag)
+                    continue
 
-        # Get NUPN information
-        for unit in structure.findall(xmlns + 'unit'):
+                path.pop()
+                if node.tag == PNML_NUPN_UNIT and path == PNML_NUPN_UNIT_PARENTS:
+                    self.parse_unit(node)
+                    node.clear()
+                elif node.tag == PNML_NUPN_STRUCTURE and path == PNML_NUPN_STRUCTURE_PARENTS:
+                    break
+                elif node.tag == PNML_PLACE or node.tag == PNML_TRANSITION or node.tag == PNML_ARC:
+                    node.clear()
 
-            # Get name
-            name = unit.attrib["id"]
+    def parse_unit(self, unit: Element) -> None:
+        """ Unit parser.
 
-            # Get places
-            pnml_places = unit.find(xmlns + 'places')
-            places = {place for place in pnml_places.text.split()} if pnml_places is not None and pnml_places.text else set()
+        Parameters
+        ----------
+        unit : Element
+            Unit node (.pnml format).
+        """
+        # Get name
+        name = unit.attrib["id"]
 
-            # Get subunits
-            pnml_subunits = unit.find(xmlns + 'subunits')
-            subunits = {self.get_unit(subunit) for subunit in pnml_subunits.text.split()} if pnml_subunits is not None and pnml_subunits.text else set()
+        # Get places
+        pnml_places = unit.find(PNML_NUPN_PLACES)
+        places = set(map(intern, pnml_places.text.split())) if pnml_places is not None and pnml_places.text else set()
 
-            # Create new unit
-            new_unit = self.get_unit(name)
-            new_unit.places = places
-            new_unit.subunits = subunits
+        # Get subunits
+        pnml_subunits = unit.find(PNML_NUPN_SUBUNITS)
+        subunits = {self.get_unit(subunit) for subunit in pnml_subunits.text.split()} if pnml_subunits is not None and pnml_subunits.text else set()
+
+        # Create new unit
+        new_unit = self.get_unit(name)
+        new_unit.places = places
+        new_unit.subunits = subunits
 
     def get_unit(self, unit: str) -> Unit:
         """ Return the corresponding unit,
@@ -1186,11 +1558,12 @@ class NUPN:
         unit
             Corresponding unit (fresh if did not exist)
         """
-        if unit in self.units:
-            return self.units[unit]
+        existing_unit = self.units.get(unit)
+        if existing_unit is not None:
+            return existing_unit
 
         new_unit = Unit(unit)
-        self.units[unit] = new_unit
+        self.units[new_unit.id] = new_unit
 
         return new_unit
 
@@ -1217,7 +1590,7 @@ class Unit:
             An identifier.
         """
         # Id
-        self.id: str = id
+        self.id: str = intern(id)
 
         # Set of places
         self.places: set[str] = set()
@@ -1233,7 +1606,7 @@ class Unit:
         str
             Debugging format.
         """
-        return "# {}: [{}] - [{}]".format(self.id, ' '.join(self.places), ' '.join(map(lambda subunit: subunit.id, self.subunits)))
+        return f"# {self.id}: [{' '.join(self.places)}] - [{' '.join([subunit.id for subunit in self.subunits])}]"
 
     def smtlib(self) -> str:
         """ Declare the unit and assert the local constraint.
@@ -1247,38 +1620,38 @@ class Unit:
             return ""
 
         # Declaration
-        smt_input = "(declare-const {} Int)\n".format(self.id)
+        smt_input = f"(declare-const {self.id} Int)\n"
 
         # Unit content
         smt_input_places = ' '.join(self.places)
         if len(self.places) > 1:
-            smt_input_places = "(+ {})".format(smt_input_places)
-        smt_input += "(assert (= {} {}))\n".format(self.id, smt_input_places)
+            smt_input_places = f"(+ {smt_input_places})"
+        smt_input += f"(assert (= {self.id} {smt_input_places}))\n"
 
         # Assert safe unit definition
-        smt_input += "(assert (<= {} 1))\n".format(self.id)
+        smt_input += f"(assert (<= {self.id} 1))\n"
 
         return smt_input
 
-    def compute_paths(self) -> list[list[Unit]]:
-        """ Recursively compute hierarchical paths.
+    def compute_paths(self) -> Iterator[list[Unit]]:
+        """ Compute hierarchical paths (depth-first, with an explicit stack).
 
         Returns
         -------
-        list of list of Unit
-            List of paths.
+        Iterator of list of Unit
+            Paths, from a leaf unit up to the current unit (units without places are skipped).
         """
-        if not self.subunits:
-            if self.places:
-                return [[self]]
-            else:
-                return [[]]
+        # Stack of units to visit, with their ancestors having places (bottom-up)
+        stack: list[tuple[Unit, tuple[Unit, ...]]] = [(self, ())]
 
-        paths = [
-            path for subunit in self.subunits for path in subunit.compute_paths()]
+        while stack:
+            unit, ancestors = stack.pop()
 
-        if self.places:
-            for path in paths:
-                path.append(self)
+            if unit.places:
+                ancestors = (unit,) + ancestors
 
-        return paths
+            if not unit.subunits:
+                yield list(ancestors)
+            else:
+                # Reversed to visit the subunits in their iteration order
+                stack.extend([(subunit, ancestors) for subunit in reversed(list(unit.subunits))])
@@ -28,9 +28,22 @@ __contact__ = "namat@laas.fr"
 __license__ = "GPLv3"
 __version__ = "5.0"
 
-from re import DOTALL, search, split
-from sys import exit
-from typing import Optional
+from sys import exit, intern
+from typing import Callable, Optional
+
+from smpt.ptio.ptnet import SMTLIB_CURRENT_ORDER, SMTLIB_FORBIDDEN_BRACES, SMTLIB_FORBIDDEN_CHARACTERS, SMTLIB_NEXT_ORDER
+
+# Header of the section of the equations generated by `reduce` (ended by the last blank line)
+GENERATED_EQUATIONS = 'generated equations\n'
+
+# Tags of the equations not asserted (after translation of '#')
+IGNORED_EQUATIONS = {'. O', '. C'}
+
+# Operators of the (in)equations
+COMPARISON_OPERATORS = {'=', '<=', '>=', '<', '>'}
+
+# Signs of the terms (minus flag)
+SIGNS = {'+': False, '-': True}
 
 
 class System:
@@ -46,6 +59,20 @@ class System:
         A list of additional variables (not places from initial net).
     equations : list of Equation
         A list of (in)equations.
+    equations_reduced : list of Equation
+        Equations involving places from the reduced net.
+    equations_not_reduced : list of Equation
+        Equations not involving places from the reduced net.
+    additional_vars_declarations : str
+        Declarations of the additional variables with an order placeholder.
+    free_vars_declarations : str
+        Declarations of the additional variables not in the reduced net with an order placeholder.
+    declarations : dict of (str, int): str
+        Declarations already rendered, by template and order.
+    links : str
+        Equalities between the places common to both nets, with placeholders for the orders of the reduced and initial nets.
+    equations_templates : dict of bool: str
+        Assertions of the equations with order placeholders, by involvement of places from the reduced net (None for all of them, built on first use).
     """
 
     def __init__(self, filename: str, places_initial: Optional[list[str]] = None, places_reduced: Optional[list[str]] = None) -> None:
@@ -60,8 +87,9 @@ class System:
         places_reduced : list of str, optional
             A list of place identifiers from the reduced Petri net.
         """
-        self.places_initial: set[str] = set(places_initial) if places_initial is not None else set()
-        self.places_reduced: set[str] = set(places_reduced) if places_reduced is not None else set()
+        # Identifiers are interned, shared with the variables
+        self.places_initial: set[str] = set(map(intern, places_initial)) if places_initial is not None else set()
+        self.places_reduced: set[str] = set(map(intern, places_reduced)) if places_reduced is not None else set()
 
         self.additional_vars: dict[str, Variable] = {}
         self.removed_vars: set[str] = self.places_initial - self.places_reduced
@@ -70,6 +98,21 @@ class System:
 
         self.parser(filename)
 
+        # Partition the equations once for the BMC and PDR emitters
+        self.equations_reduced: list[Equation] = [eq for eq in self.equations if eq.contain_reduced]
+        self.equations_not_reduced: list[Equation] = [eq for eq in self.equations if not eq.contain_reduced]
+
+        # Declarations rendered once, only the order is substituted (see `smtlib_order`)
+        placeholder = '@' + SMTLIB_CURRENT_ORDER
+        self.additional_vars_declarations: str = ''.join([f"(declare-const {var.id}{placeholder} Int)\n(assert (>= {var.id}{placeholder} 0))\n" if var.in_reduced else f"(declare-const {var.id}{placeholder} Int)\n" for var in self.additional_vars.values()])
+        self.free_vars_declarations: str = ''.join([f"(declare-const {var.id}{placeholder} Int)\n" for var in self.additional_vars.values() if not var.in_reduced])
+        self.declarations: dict[tuple[str, Optional[int]], str] = {}
+
+        # Places common to both nets intersected once (see `smtlib_link_nets`)
+        self.links: str = ''.join([f"(assert (= {pl}@{SMTLIB_CURRENT_ORDER} {pl}@{SMTLIB_NEXT_ORDER}))\n" for pl in self.places_reduced & self.places_initial])
+
+        self.equations_templates: dict[Optional[bool], str] = {}
+
     def __str__(self) -> str:
         """ Equations to textual format.
 
@@ -80,6 +123,31 @@ class System:
         """
         return '\n'.join(map(str, self.equations))
 
+    def smtlib_order(self, declarations: str, k: Optional[int]) -> str:
+        """ Substitute the order placeholder of pre-rendered declarations.
+
+        Note
+        ----
+        Memoized, the same orders are declared again after each solver reset.
+
+        Parameters
+        ----------
+        declarations : str
+            Declarations with an order placeholder.
+        k : int, optional
+            Order.
+
+        Returns
+        -------
+        str
+            SMT-LIB format.
+        """
+        smt_input = self.declarations.get((declarations, k))
+        if smt_input is None:
+            smt_input = self.declarations[(declarations, k)] = declarations.replace('@' + SMTLIB_CURRENT_ORDER, f"@{k}" if k is not None else '')
+
+        return smt_input
+
     def smtlib(self, k: Optional[int] = None, k_initial: Optional[int] = None) -> str:
         """ Declare the additional variables and assert the equations.
 
@@ -95,17 +163,60 @@ class System:
         str
             SMT-LIB format.
         """
-        if k is None:
-            smt_input = ''.join(map(lambda var: "(declare-const {} Int)\n(assert (>= {} 0))\n".format(var.id, var.id) if var.in_reduced else "(declare-const {} Int)\n".format(var.id), self.additional_vars.values()))
-        else:
-            smt_input = ''.join(map(lambda var: "(declare-const {}@{} Int)\n(assert (>= {}@{} 0))\n".format(var.id, k, var.id, k) if var.in_reduced else "(declare-const {}@{} Int)\n".format(var.id, k), self.additional_vars.values()))
+        return self.smtlib_order(self.additional_vars_declarations, k) + self.smtlib_equations(None, k, k_initial)
 
-        if k is None and k_initial is None:
-            smt_input += '\n'.join(map(lambda eq: eq.smtlib(), self.equations)) + '\n'
-        else:
-            smt_input += '\n'.join(map(lambda eq: eq.smtlib_with_order(k, k_initial), self.equations)) + '\n'
+    def write_smtlib(self, write: Callable[[str], None], k: Optional[int] = None, k_initial: Optional[int] = None) -> None:
+        """ Write the declarations of the additional variables and the equations.
 
-        return smt_input
+        Parameters
+        ----------
+        write : Callable[[str], None]
+            Output (e.g. the `write` method of a solver).
+        k : int, optional
+            Order for the current net (reduced one).
+        k_initial : int, optional
+            Order for the initial net (used by PDR).
+
+        Note
+        ----
+        Both blocks are written separately, never concatenated (see `smtlib`).
+        The Z3 interface writes them through its bounded input buffer, which is sent to the solver
+        whenever it fills up.
+        """
+        write(self.smtlib_order(self.additional_vars_declarations, k))
+        write(self.smtlib_equations(None, k, k_initial))
+
+    def smtlib_equations(self, contain_reduced: Optional[bool], k: Optional[int] = None, k_initial: Optional[int] = None) -> str:
+        """ Assert a group of equations, from their template.
+
+        Note
+        ----
+        The equations are rendered once with order placeholders (see `Equation.smtlib_template`),
+        each call only substitutes the orders.
+
+        Parameters
+        ----------
+        contain_reduced : bool, optional
+            Equations involving places from the reduced net or not (all of them if None).
+        k : int, optional
+            Order for the current net (reduced one).
+        k_initial : int, optional
+            Order for the initial net (used by PDR).
+
+        Returns
+        --------
+        str
+            SMT-LIB format.
+        """
+        template = self.equations_templates.get(contain_reduced)
+        if template is None:
+            if contain_reduced is None:
+                equations = self.equations
+            else:
+                equations = self.equations_reduced if contain_reduced else self.equations_not_reduced
+            template = self.equations_templates[contain_reduced] = ''.join([eq.smtlib_template() + '\n' for eq in equations])
+
+        return Equation.substitute_orders(template, k, k_initial)
 
     def minizinc(self) -> str:
         """ Declare the additional variables and assert the equations.
@@ -115,15 +226,10 @@ class System:
         str
             MiniZinc format.
         """
-        minizinc_input = ""
-
-        for var in self.additional_vars.values():
-            if not var.in_reduced:
-                minizinc_input += "var 0..MAX: {};\n".format(var)
-
-        minizinc_input += ''.join(map(lambda eq: eq.minizinc(), self.equations))
+        minizinc_input = [f"var 0..MAX: {var};\n" for var in self.additional_vars.values() if not var.in_reduced]
+        minizinc_input.extend([eq.minizinc() for eq in self.equations])
 
-        return minizinc_input
+        return ''.join(minizinc_input)
 
     def barvinok(self) -> str:
         """ Assert the equations (quite similar than MiniZinc).
@@ -133,7 +239,7 @@ class System:
         str
             Barvinok format.
         """
-        return ' and '.join(map(lambda eq: eq.minizinc(), self.equations))
+        return ' and '.join([eq.minizinc() for eq in self.equations])
 
     def smtlib_declare_additional_variables(self, k_initial: Optional[int] = None) -> str:
         """ Declare the additional variables.
@@ -148,14 +254,7 @@ class System:
         str
             SMT-LIB format.
         """
-        smt_input = ""
-
-        for var in self.additional_vars.values():
-            if not var.in_reduced:
-                var_name = var.id if k_initial is None else "{}@{}".format(var.id, k_initial)
-                smt_input += "(declare-const {} Int)\n".format(var_name)
-
-        return smt_input
+        return self.smtlib_order(self.free_vars_declarations, k_initial)
 
     def smtlib_equations_without_places_from_reduced_net(self, k_initial: Optional[int] = None) -> str:
         """ Assert equations not involving places in the reduced net.
@@ -170,13 +269,7 @@ class System:
         str
             SMT-LIB format.
         """
-        smt_input = ""
-
-        for eq in self.equations:
-            if not eq.contain_reduced:
-                smt_input += eq.smtlib(k_initial) + '\n'
-
-        return smt_input
+        return self.smtlib_equations(False, None, k_initial)
 
     def smtlib_equations_with_places_from_reduced_net(self, k: int, k_initial: Optional[int] = None) -> str:
         """ Assert equations involving places in the reduced net.
@@ -193,13 +286,7 @@ class System:
         str
             SMT-LIB format.
         """
-        smt_input = ""
-
-        for eq in self.equations:
-            if eq.contain_reduced:
-                smt_input += eq.smtlib_with_order(k, k_initial) + '\n'
-
-        return smt_input
+        return self.smtlib_equations(True, k, k_initial)
 
     def smtlib_link_nets(self, k: int, k_initial: Optional[int] = None) -> str:
         """ Assert equalities between places common to the initial and reduced nets.
@@ -216,15 +303,7 @@ class System:
         str
             SMT-LIB format.
         """
-        smt_input = ""
-
-        for pl in self.places_reduced & self.places_initial:
-            if k_initial is None:
-                smt_input += "(assert (= {}@{} {}))\n".format(pl, k, pl)
-            else:
-                smt_input += "(assert (= {}@{} {}@{}))\n".format(pl, k, pl, k_initial)
-
-        return smt_input
+        return self.links.replace('@' + SMTLIB_CURRENT_ORDER, f"@{k}").replace('@' + SMTLIB_NEXT_ORDER, f"@{k_initial}" if k_initial is not None else '')
 
     def parser(self, filename: str) -> None:
         """ System of reduction equations parser.
@@ -241,15 +320,20 @@ class System:
         """
         try:
             with open(filename, 'r') as fp:
-                content = search(r'generated equations\n(.*)?\n\n', fp.read().replace('#', '.').replace(',', '.'), DOTALL)  # '#' and ',' forbidden in SMT-LIB
-                if content:
-                    for line in split('\n+', content.group())[1:-1]:
-                        if line.partition(' |- ')[0] not in ['. O', '. C']:
-                            self.equations.append(Equation(line, self))
-            fp.close()
+                content = fp.read()
         except FileNotFoundError as e:
             exit(e)
 
+        # Locate the section without regex
+        start = content.find(GENERATED_EQUATIONS)
+        end = content.rfind('\n\n', start + len(GENERATED_EQUATIONS)) if start >= 0 else -1
+
+        if end >= 0:
+            # Only the equations are translated ('#' and ',' forbidden in SMT-LIB)
+            for line in filter(None, content[start + len(GENERATED_EQUATIONS):end].translate(SMTLIB_FORBIDDEN_CHARACTERS).split('\n')):
+                if line.partition(' |- ')[0] not in IGNORED_EQUATIONS:
+                    self.equations.append(Equation(line, self))
+
 
 class Equation:
     """ Reduction equation.
@@ -264,8 +348,12 @@ class Equation:
         An operator (=, <=, >=, <, >).
     contain_reduced : bool
         A boolean indicating whether the equation involves places from the reduced net.
+    template : str, optional
+        Assertion with placeholders for the orders of the reduced and initial nets (built on first use).
     """
 
+    __slots__ = ('left', 'right', 'operator', 'contain_reduced', 'template')
+
     def __init__(self, content: str, system: System) -> None:
         """ Initializer.
 
@@ -282,6 +370,8 @@ class Equation:
 
         self.contain_reduced: bool = False
 
+        self.template: Optional[str] = None
+
         self.parse_equation(content, system)
 
     def __str__(self) -> str:
@@ -307,31 +397,36 @@ class Equation:
         str
             SMT-LIB format.
         """
-        return "(assert ({}".format(self.operator) \
-               + self.member_smtlib(self.left, k_initial) \
-               + self.member_smtlib(self.right, k_initial) \
-               + "))"
+        return self.substitute_orders(self.smtlib_template(), None, k_initial)
 
-    def minizinc(self) -> str:
-        """ Assert the Equation.
+    def smtlib_template(self) -> str:
+        """ Assert the Equation with order placeholders.
+
+        Note
+        ----
+        Places from the reduced net are suffixed by `SMTLIB_CURRENT_ORDER`,
+        other variables by `SMTLIB_NEXT_ORDER` (order of the initial net).
 
         Returns
         -------
-            MiniZinc format.
+        str
+            SMT-LIB format (template).
         """
-        return "constraint " \
-               + self.member_minizinc(self.left) \
-               + " {} ".format(self.operator) \
-               + self.member_minizinc(self.right) \
-               + ";\n"
+        if self.template is None:
+            self.template = f"(assert ({self.operator}{self.member_smtlib_with_order(self.left, SMTLIB_CURRENT_ORDER, SMTLIB_NEXT_ORDER)}{self.member_smtlib_with_order(self.right, SMTLIB_CURRENT_ORDER, SMTLIB_NEXT_ORDER)}))"
 
-    def member_smtlib(self, member: list[Variable], k_initial: Optional[int] = None) -> str:
-        """ Helper to assert a member (left or right).
+        return self.template
+
+    @staticmethod
+    def substitute_orders(template: str, k: Optional[int], k_initial: Optional[int] = None) -> str:
+        """ Substitute the order placeholders of a template.
 
         Parameters
         ----------
-        member : list of Variable
-            One of the two members (left or right).
+        template : str
+            Assertions with order placeholders.
+        k : int, optional
+            Order for the current net (reduced one).
         k_initial : int, optional
             Order for the initial net (used by PDR).
 
@@ -340,18 +435,16 @@ class Equation:
         str
             SMT-LIB format.
         """
-        smt_input = ""
-
-        for var in member:
-            if k_initial is None or var.in_reduced:
-                smt_input += var.smtlib()
-            else:
-                smt_input += var.smtlib(k_initial)
+        return template.replace('@' + SMTLIB_CURRENT_ORDER, f"@{k}" if k is not None else '').replace('@' + SMTLIB_NEXT_ORDER, f"@{k_initial}" if k_initial is not None else '')
 
-        if len(member) > 1:
-            smt_input = " (+{})".format(smt_input)
+    def minizinc(self) -> str:
+        """ Assert the Equation.
 
-        return smt_input
+        Returns
+        -------
+            MiniZinc format.
+        """
+        return f"constraint {self.member_minizinc(self.left)} {self.operator} {self.member_minizinc(self.right)};\n"
 
     def member_minizinc(self, member: list[Variable]) -> str:
         """ Helper to assert a member (left or right).
@@ -366,7 +459,7 @@ class Equation:
         str
             MiniZinc format.
         """
-        return ' + '.join(map(lambda var: var.minizinc(), member))
+        return ' + '.join([var.minizinc() for var in member])
 
     def smtlib_with_order(self, k: Optional[int], k_initial: Optional[int] = None) -> str:
         """ Assert equations with order.
@@ -383,10 +476,7 @@ class Equation:
         str
             SMT-LIB format.
         """
-        return "(assert ({}".format(self.operator) \
-               + self.member_smtlib_with_order(self.left, k, k_initial) \
-               + self.member_smtlib_with_order(self.right, k, k_initial) \
-               + "))"
+        return self.substitute_orders(self.smtlib_template(), k, k_initial)
 
     def member_smtlib_with_order(self, member, k: Optional[int], k_initial: Optional[int] = None) -> str:
         """ Helper to assert a member with order (left or right).
@@ -404,17 +494,10 @@ class Equation:
         str
             SMT-LIB format.
         """
-        smt_input = ""
-        for var in member:
-            if var.in_reduced:
-                smt_input += var.smtlib(k)
-            elif k_initial is not None:
-                smt_input += var.smtlib(k_initial)
-            else:
-                smt_input += var.smtlib()
+        smt_input = ''.join([var.smtlib(k if var.in_reduced else k_initial) for var in member])
 
         if len(member) > 1:
-            smt_input = " (+{})".format(smt_input)
+            smt_input = f" (+{smt_input})"
 
         return smt_input
 
@@ -433,10 +516,7 @@ class Equation:
         str
             SMT-LIB format.
         """
-        return "({}".format(self.operator) \
-               + self.member_smtlib_with_order(self.left, k, k_initial) \
-               + self.member_smtlib_with_order(self.right, k, k_initial) \
-               + ")"
+        return f"({self.operator}{self.member_smtlib_with_order(self.left, k, k_initial)}{self.member_smtlib_with_order(self.right, k, k_initial)})"
 
     def parse_equation(self, content: str, system: System) -> None:
         """ Equation parser.
@@ -448,44 +528,44 @@ class Equation:
         system : System
             Current system of reduction equations. 
         """
-        elements = split(r'\s+', content.partition(' |- ')[2])
+        elements = content.partition(' |- ')[2].split()
 
         current, inversed = self.left, self.right
         minus = False
 
         for element in elements:
 
-            if not element:
-                continue
-
-            if element in ['=', '<=', '>=', '<', '>']:
+            if element in COMPARISON_OPERATORS:
                 self.operator = element
                 current, inversed = inversed, current
                 minus = False
                 continue
 
-            if element == '+':
-                minus = False
-                continue
-
-            if element == '-':
-                minus = True
+            sign = SIGNS.get(element)
+            if sign is not None:
+                minus = sign
                 continue
 
             multiplier = None
 
-            # `convert` specific case
-            if '-1.' in element:
-                element = element.replace('-1.', '')
-                minus ^= True
-                if minus:
-                    current.append(Variable('0', multiplier))
+            # Scan the term only if it may have a multiplier or braces
+            if '.' in element:
+                # `convert` specific case
+                if '-1.' in element:
+                    element = element.replace('-1.', '')
+                    minus ^= True
+                    if minus:
+                        current.append(Variable('0', multiplier))
 
-            elif element.rfind('.') > element.rfind('}'):
-                index = element.rfind('.')
-                multiplier, element = element[:index], element[index+1:]
+                else:
+                    index = element.rfind('.')
+                    if index > element.rfind('}'):
+                        multiplier, element = element[:index], element[index+1:]
 
-            variable = Variable(element.replace('{', '').replace('}', ''), multiplier)
+            if '{' in element or '}' in element:
+                element = element.translate(SMTLIB_FORBIDDEN_BRACES)
+
+            variable = Variable(element, multiplier)
             self.check_variable(variable, system)
 
             if not minus:
@@ -532,8 +612,12 @@ class Variable:
         Variable in the reduced net.
     is_constant : bool
         Is a constant.
+    renderings : dict of int: str
+        SMT-LIB renderings for each order (memoization).
     """
 
+    __slots__ = ('id', 'multiplier', 'in_reduced', 'is_constant', 'renderings')
+
     def __init__(self, id: str, multiplier: Optional[str] = None) -> None:
         """ Initializer.
 
@@ -544,12 +628,14 @@ class Variable:
         multiplier : int, optional
             A multiplier.
         """
-        self.id: str = id
+        self.id: str = intern(id)
         self.multiplier: Optional[str] = multiplier
 
         self.in_reduced: bool = False
         self.is_constant: bool = False
 
+        self.renderings: dict[Optional[int], str] = {}
+
     def __str__(self) -> str:
         """ Variable to textual format.
 
@@ -558,12 +644,7 @@ class Variable:
         str
             Debugging format.
         """
-        text = ""
-
-        if self.multiplier is not None:
-            text += "{}.".format(self.multiplier)
-
-        return text + self.id
+        return self.id if self.multiplier is None else f"{self.multiplier}.{self.id}"
 
     def smtlib(self, k: Optional[int] = None) -> str:
         """ Assert the Variable and its multiplier if needed.
@@ -578,18 +659,20 @@ class Variable:
         str
             SMT-LIB format.
         """
-        if self.is_constant:
-            return " " + self.id
+        # Memoized for each order
+        smtlib_input = self.renderings.get(k)
+        if smtlib_input is not None:
+            return smtlib_input
 
-        smtlib_input = self.id
-
-        if k is not None:
-            smtlib_input += "@{}".format(k)
+        if self.is_constant:
+            smtlib_input = " " + self.id
 
-        if self.multiplier is not None:
-            smtlib_input = "(* {} {})".format(self.multiplier, smtlib_input)
+        else:
+            identifier = self.id if k is None else f"{self.id}@{k}"
+            smtlib_input = f" {identifier}" if self.multiplier is None else f" (* {self.multiplier} {identifier})"
 
-        return " {}".format(smtlib_input)
+        self.renderings[k] = smtlib_input
+        return smtlib_input
 
     def minizinc(self) -> str:
         """ Assert the Variable and its multiplier if needed.
@@ -602,6 +685,6 @@ class Variable:
         minizinc_input = self.id
 
         if self.multiplier:
-            minizinc_input = "({} * {})".format(self.multiplier, minizinc_input)
+            minizinc_input = f"({self.multiplier} * {minizinc_input})"
 
         return minizinc_input
@@ -392,7 +392,7 @@ def main():
         fp_markings.close()
 
     # Read properties and keep skeleton ones in not fully reducible
-    properties = Properties(ptnet, ptnet_tfg=ptnet_tfg, xml_filename=results.path_properties, fireability=results.fireability, simplify=results.mcc and not results.queries, answered=answered)
+    properties = Properties(ptnet, ptnet_tfg=ptnet_tfg, xml_filename=results.path_properties, fireability=results.fireability, simplify=results.mcc and not results.queries, answered=answered, lazy=bool(results.queries))
 
     # Parse .ltl file if there is one
     if results.path_ltl_formula: